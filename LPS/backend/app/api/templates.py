@@ -2,61 +2,96 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-import json
 from pathlib import Path
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from typing_extensions import TypedDict
 
-from app.db.models import Template
+from app.core.template_html import (
+    TemplateRenderError,
+    normalize_html_file_path,
+    render_template_html,
+)
+from app.db.models import Template, TemplateStatus
 from app.db.session import get_db
 
 router = APIRouter(tags=["templates"])
 
+# 当前文件位于 backend/app/api/templates.py
+# parents[0] = .../backend/app/api
+# parents[1] = .../backend/app
+# parents[2] = .../backend
+_BACKEND_ROOT = Path(__file__).resolve().parents[2]
+_GENERATED_ROOT = _BACKEND_ROOT / "generated"
+
 
 def _get_backend_root() -> Path:
   """获取 backend 根目录，例如 LPS_creativ/LPS/backend/"""
-  # 当前文件位于 backend/app/api/templates.py
-  # parents[0] = .../backend/app/api
-  # parents[1] = .../backend/app
-  # parents[2] = .../backend
-  return Path(__file__).resolve().parents[2]
+  return _BACKEND_ROOT
 
 
 def _get_generated_root() -> Path:
   """生成静态 HTML 文件的根目录"""
-  return _get_backend_root() / "generated"
-
+  return _GENERATED_ROOT
 
-def _get_templates_root() -> Path:
-  """模板静态资源根目录 LPS_creativ/LPS/templates"""
-  return _get_backend_root().parent / "templates"
 
-
-class TemplateItem(BaseModel):
+class TemplateItem(TypedDict):
   """单个模板的对外展示字段。"""
 
   id: int
   name: str
-  description: Optional[str] = None
-  thumbnail_url: Optional[str] = None
+  description: Optional[str]
+  thumbnail_url: Optional[str]
   html_file_path: str
   max_videos: int
-  static_assets_path: Optional[str] = None
+  static_assets_path: Optional[str]
   status: str
 
 
-class TemplateListData(BaseModel):
+# 对外展示的模板字段，与 TemplateItem 一一对应；列表查询也只取这些列
+_TEMPLATE_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "thumbnail_url",
+    "html_file_path",
+    "max_videos",
+    "static_assets_path",
+    "status",
+)
+_TEMPLATE_LIST_COLUMNS = tuple(getattr(Template, f) for f in _TEMPLATE_FIELDS)
+
+
+def _template_item(t: Template) -> TemplateItem:
+  """由 ORM 对象构建 TemplateItem。"""
+  return TemplateItem(**{f: getattr(t, f) for f in _TEMPLATE_FIELDS})
+
+
+def _apply_filters(stmt: Select, status: Optional[str]) -> Select:
+  """为列表查询与计数查询统一追加过滤条件，保证两者口径一致。"""
+  if status:
+    stmt = stmt.where(Template.status == status)
+  return stmt
+
+
+class TemplateListData(TypedDict):
   """模板列表响应中的 data 部分。"""
 
-  total: int
+  # 仅在 with_total=true 时计算，否则为 None
+  total: Optional[int]
   items: List[TemplateItem]
+  has_more: bool
+  # 游标分页：下一页请求时作为 cursor 传回；没有更多数据时为 None
+  next_cursor: Optional[int]
 
 
-class TemplateListResponse(BaseModel):
+class TemplateListResponse(TypedDict):
   """模板列表接口的标准返回结构。"""
 
   code: int
@@ -64,13 +99,13 @@ class TemplateListResponse(BaseModel):
   data: TemplateListData
 
 
-class TemplatePreviewData(BaseModel):
+class TemplatePreviewData(TypedDict):
   """模板预览返回的 data 部分。"""
 
   preview_url: str
 
 
-class TemplatePreviewResponse(BaseModel):
+class TemplatePreviewResponse(TypedDict):
   """模板预览接口的标准返回结构。"""
 
   code: int
@@ -98,24 +133,25 @@ class TemplateCreateRequest(BaseModel):
   static_assets_path: Optional[str] = Field(
       default=None, description="静态资源路径（CSS/JS/图片）"
   )
-  status: str = Field(default="active", description="模板状态")
+  status: TemplateStatus = Field(default="active", description="模板状态")
 
 
-class TemplateCreateResponse(BaseModel):
+class TemplateCreateResponse(TypedDict):
   code: int
   message: str
-  data: TemplateItem
+  data: Optional[TemplateItem]
 
 
-class SimpleResponse(BaseModel):
+class SimpleResponse(TypedDict):
   code: int
   message: str
-  data: dict = Field(default_factory=dict)
+  data: dict
 
 
 @router.get(
   "/templates",
   response_model=TemplateListResponse,
+  response_class=ORJSONResponse,
   summary="查询模板列表",
   description="按状态和分页查询模板列表。",
 )
@@ -130,61 +166,75 @@ def list_templates(
       le=100,
       description="每页数量，默认 20，最大 100。",
   ),
+  cursor: Optional[int] = Query(
+      default=None,
+      ge=1,
+      description="游标，传入上一页返回的 next_cursor；传入后忽略 page。",
+  ),
+  with_total: bool = Query(
+      default=False,
+      description="是否返回总数 total；只需判断是否有下一页时用 has_more 即可。",
+  ),
   db: Session = Depends(get_db),
-) -> TemplateListResponse:
-  query = select(Template)
-
-  if status:
-    query = query.where(Template.status == status)
-
-  count_stmt = select(func.count()).select_from(query.subquery())
-  total: int = db.execute(count_stmt).scalar_one()
-
-  offset = (page - 1) * page_size
-  templates: List[Template] = (
-      db.execute(
-          query.order_by(Template.id.desc()).offset(offset).limit(page_size)
-      )
-      .scalars()
-      .all()
-  )
+) -> ORJSONResponse:
+  query = _apply_filters(select(*_TEMPLATE_LIST_COLUMNS), status)
+
+  # COUNT(*) 需要扫描全部匹配行，只在调用方明确需要总数时才执行
+  total: Optional[int] = None
+  if with_total:
+    count_stmt = _apply_filters(
+        select(func.count()).select_from(Template), status
+    )
+    total = db.execute(count_stmt).scalar_one()
 
-  items = [
-      TemplateItem(
-          id=t.id,
-          name=t.name,
-          description=t.description,
-          thumbnail_url=t.thumbnail_url,
-          html_file_path=t.html_file_path,
-          max_videos=t.max_videos,
-          static_assets_path=t.static_assets_path,
-          status=t.status,
+  query = query.order_by(Template.id.desc())
+  if cursor:
+    # 按主键倒序做游标分页，直接走主键索引定位，避免 OFFSET 逐行跳过
+    query = query.where(Template.id < cursor)
+  else:
+    # 兼容旧的页码分页
+    query = query.offset((page - 1) * page_size)
+
+  # 多取一行判断是否还有下一页，代价只与 page_size 相关
+  rows = db.execute(query.limit(page_size + 1)).mappings().all()
+  has_more = len(rows) > page_size
+  rows = rows[:page_size]
+  next_cursor = rows[-1]["id"] if has_more else None
+
+  # 列表数据只读且来自数据库，直接拼成 dict 交给 orjson 序列化，
+  # 跳过 response_model 的校验与 jsonable_encoder
+  items = [dict(r) for r in rows]
+
+  return ORJSONResponse(
+      TemplateListResponse(
+          code=0,
+          message="ok",
+          data=TemplateListData(
+              total=total,
+              items=items,
+              has_more=has_more,
+              next_cursor=next_cursor,
+          ),
       )
-      for t in templates
-  ]
-
-  return TemplateListResponse(
-      code=0,
-      message="ok",
-      data=TemplateListData(total=total, items=items),
   )
 
 
 @router.post(
   "/templates",
   response_model=TemplateCreateResponse,
+  response_class=ORJSONResponse,
   summary="手动注册模板",
   description="将一套静态模板（HTML + 资源路径）注册到系统中。",
 )
 def create_template(
   payload: TemplateCreateRequest,
   db: Session = Depends(get_db),
-) -> TemplateCreateResponse:
+) -> ORJSONResponse:
   template = Template(
       name=payload.name,
       description=payload.description,
       thumbnail_url=payload.thumbnail_url,
-      html_file_path=payload.html_file_path,
+      html_file_path=normalize_html_file_path(payload.html_file_path),
       max_videos=payload.max_videos,
       static_assets_path=payload.static_assets_path,
       status=payload.status or "active",
@@ -194,23 +244,17 @@ def create_template(
   db.commit()
   db.refresh(template)
 
-  item = TemplateItem(
-      id=template.id,
-      name=template.name,
-      description=template.description,
-      thumbnail_url=template.thumbnail_url,
-      html_file_path=template.html_file_path,
-      max_videos=template.max_videos,
-      static_assets_path=template.static_assets_path,
-      status=template.status,
+  return ORJSONResponse(
+      TemplateCreateResponse(
+          code=0, message="ok", data=_template_item(template)
+      )
   )
 
-  return TemplateCreateResponse(code=0, message="ok", data=item)
-
 
 @router.put(
   "/templates/{template_id}",
   response_model=TemplateCreateResponse,
+  response_class=ORJSONResponse,
   summary="编辑模板信息",
   description="根据 ID 更新模板的基础信息。",
 )
@@ -218,68 +262,66 @@ def update_template(
   template_id: int,
   payload: TemplateCreateRequest,
   db: Session = Depends(get_db),
-) -> TemplateCreateResponse:
+) -> ORJSONResponse:
   template: Optional[Template] = db.get(Template, template_id)
   if not template:
-    return TemplateCreateResponse(
-        code=1,
-        message=f"template {template_id} not found",
-        data=None,  # type: ignore[arg-type]
+    return ORJSONResponse(
+        TemplateCreateResponse(
+            code=1,
+            message=f"template {template_id} not found",
+            data=None,
+        )
     )
 
   template.name = payload.name
   template.description = payload.description
   template.thumbnail_url = payload.thumbnail_url
-  template.html_file_path = payload.html_file_path
+  template.html_file_path = normalize_html_file_path(payload.html_file_path)
   template.max_videos = payload.max_videos
   template.static_assets_path = payload.static_assets_path
   template.status = payload.status or template.status
 
-  db.add(template)
   db.commit()
   db.refresh(template)
 
-  item = TemplateItem(
-      id=template.id,
-      name=template.name,
-      description=template.description,
-      thumbnail_url=template.thumbnail_url,
-      html_file_path=template.html_file_path,
-      max_videos=template.max_videos,
-      static_assets_path=template.static_assets_path,
-      status=template.status,
+  return ORJSONResponse(
+      TemplateCreateResponse(
+          code=0, message="ok", data=_template_item(template)
+      )
   )
 
-  return TemplateCreateResponse(code=0, message="ok", data=item)
-
 
 @router.delete(
   "/templates/{template_id}",
   response_model=SimpleResponse,
+  response_class=ORJSONResponse,
   summary="删除模板",
   description="根据 ID 删除一条模板记录（当前为硬删除）。",
 )
 def delete_template(
   template_id: int,
   db: Session = Depends(get_db),
-) -> SimpleResponse:
+) -> ORJSONResponse:
   template: Optional[Template] = db.get(Template, template_id)
   if not template:
-    return SimpleResponse(
-        code=1,
-        message=f"template {template_id} not found",
-        data={},
+    return ORJSONResponse(
+        SimpleResponse(
+            code=1,
+            message=f"template {template_id} not found",
+            data={},
+        )
     )
 
   db.delete(template)
   db.commit()
 
-  return SimpleResponse(code=0, message="ok", data={})
+  return ORJSONResponse(SimpleResponse(code=0, message="ok", data={}))
 
 
 @router.post(
   "/templates/{template_id}/preview",
   response_model=TemplatePreviewResponse,
+  response_class=ORJSONResponse,
   summary="预览模板",
   description=(
       "根据模板 ID 读取 HTML 文件，修正静态资源路径，"
@@ -289,101 +331,47 @@ def delete_template(
 def preview_template(
   template_id: int,
   db: Session = Depends(get_db),
-) -> TemplatePreviewResponse:
+) -> ORJSONResponse:
   template: Optional[Template] = db.get(Template, template_id)
   if not template:
-    return TemplatePreviewResponse(
-        code=1,
-        message=f"template {template_id} not found",
-        data=None,
-    )
-
-  # 解析模板 HTML 文件路径，兼容多种写法（与工作流预览逻辑保持一致）
-  raw_html_path = Path(template.html_file_path)
-  backend_root = _get_backend_root()
-  project_root = backend_root.parent          # LPS_creativ/LPS
-  repo_root = project_root.parent             # LPS_creativ
-  templates_root = _get_templates_root()      # LPS_creativ/LPS/templates
-
-  candidate_paths = [
-      raw_html_path,
-      project_root / raw_html_path,
-      repo_root / raw_html_path,
-      templates_root / raw_html_path,
-  ]
-
-  html_path: Optional[Path] = None
-  for p in candidate_paths:
-    try:
-      if p.is_file():
-        html_path = p
-        break
-    except Exception:
-      continue
-
-  if html_path is None:
-    return TemplatePreviewResponse(
-        code=1,
-        message=f"template html file not found for path: {template.html_file_path}",
-        data=None,
+    return ORJSONResponse(
+      TemplatePreviewResponse(
+          code=1,
+          message=f"template {template_id} not found",
+          data=None,
+      )
     )
 
+  # 模板预览不带选中视频，注入空列表，方便模板脚本统一处理
   try:
-    html_content = html_path.read_text(encoding="utf-8")
-  except Exception as e:  # pragma: no cover
-    return TemplatePreviewResponse(
-        code=1,
-        message=f"failed to read template html file: {e}",
-        data=None,
+    html_content = render_template_html(
+        template.html_file_path, template.static_assets_path, []
+    )
+  except TemplateRenderError as e:
+    return ORJSONResponse(
+      TemplatePreviewResponse(code=1, message=str(e), data=None)
     )
-
-  # 计算模板静态资源前缀（/templates/xxx），用于修正相对路径
-  static_prefix = "/templates"
-  if template.static_assets_path:
-    assets_path = Path(template.static_assets_path)
-    templates_root = _get_templates_root()
-    try:
-      if assets_path.is_absolute():
-        rel = assets_path.relative_to(templates_root)
-      else:
-        rel = (templates_root / assets_path).relative_to(templates_root)
-      static_prefix = f"/templates/{rel.as_posix()}"
-    except Exception:
-      static_prefix = "/templates"
-
-  # 将模板中的相对静态资源路径 ./xxx 改写为以 /templates/... 开头的绝对路径
-  html_content = html_content.replace('href="./', f'href="{static_prefix}/')
-  html_content = html_content.replace('src="./', f'src="{static_prefix}/')
-
-  # 注入一个空的选中视频列表，方便模板脚本统一处理
-  selected_json = json.dumps([], ensure_ascii=False)
-  snippet = (
-      '<script id="lps-selected-videos" type="application/json">'
-      f"{selected_json}"
-      "</script>"
-  )
-  if "</body>" in html_content:
-    html_content = html_content.replace("</body>", f"{snippet}\n</body>", 1)
-  else:
-    html_content += snippet
 
   # 写入预览目录：generated/template_preview/{template_id}_{uuid}.html
-  generated_root = _get_generated_root()
-  preview_dir = generated_root / "template_preview"
+  preview_dir = _get_generated_root() / "template_preview"
   preview_dir.mkdir(parents=True, exist_ok=True)
   filename = f"{template.id}_{uuid4().hex}.html"
   output_path = preview_dir / filename
 
   try:
-    output_path.write_text(html_content, encoding="utf-8")
+    output_path.write_bytes(html_content)
   except Exception as e:  # pragma: no cover
-    return TemplatePreviewResponse(
-        code=1,
-        message=f"failed to write template preview html file: {e}",
-        data=None,
+    return ORJSONResponse(
+      TemplatePreviewResponse(
+          code=1,
+          message=f"failed to write template preview html file: {e}",
+          data=None,
+      )
     )
 
   preview_url = f"/generated/template_preview/{filename}"
   data = TemplatePreviewData(preview_url=preview_url)
-  return TemplatePreviewResponse(code=0, message="ok", data=data)
+  return ORJSONResponse(
+    TemplatePreviewResponse(code=0, message="ok", data=data)
+  )
 
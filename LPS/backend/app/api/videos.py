@@ -1,49 +1,189 @@
 from __future__ import annotations
 
+import asyncio
+import math
+import shutil
 from datetime import date, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from typing_extensions import TypedDict
 
+from app.core.cache import response_cache
 from app.core.config import Settings, get_settings
 from app.db.models import Video
-from app.db.session import get_db
+from app.db.session import bulk_insert, get_db
 
 router = APIRouter(tags=["videos"])
 
+_BACKEND_ROOT = Path(__file__).resolve().parents[2]
+_GENERATED_ROOT = _BACKEND_ROOT / "generated"
+
 
 def _get_backend_root() -> Path:
     """backend 根目录，例如 LPS_creativ/LPS/backend/"""
-    return Path(__file__).resolve().parents[2]
+    return _BACKEND_ROOT
 
 
 def _get_generated_root() -> Path:
     """生成内容存放目录 backend/generated/"""
-    return _get_backend_root() / "generated"
+    return _GENERATED_ROOT
 
 
-class VideoItem(BaseModel):
+class VideoItem(TypedDict):
     """单个视频在列表中的展示字段"""
 
     id: int
     title: str
     poster_url: str
-    category: Optional[str] = None
+    category: Optional[str]
     view_count: int
-    updated_at: Optional[str] = None
+    updated_at: Optional[str]
+
+
+# 列表接口查询的列，与 VideoItem 字段一一对应
+_VIDEO_LIST_COLUMNS = (
+    Video.id,
+    Video.title,
+    Video.poster_url,
+    Video.category,
+    Video.view_count,
+    Video.updated_at,
+)
+
+
+def _video_item(v: Video) -> VideoItem:
+    """由 ORM 对象构建 VideoItem。"""
+    return VideoItem(
+        id=v.id,
+        title=v.title,
+        poster_url=v.poster_url,
+        category=v.category,
+        view_count=v.view_count,
+        updated_at=v.updated_at.isoformat() if v.updated_at else None,
+    )
+
+
+def _apply_filters(stmt: Select, category: Optional[str]) -> Select:
+    """按 category 过滤（列表与计数共用）"""
+    if category:
+        stmt = stmt.where(Video.category == category)
+    return stmt
+
+
+# 拆页拉取时的并发请求上限，避免触发上游限流
+_STCINE_MAX_CONCURRENCY = 8
+
 
+async def _fetch_stcine_page(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    base_url: str,
+    params: Dict[str, object],
+    page_no: int,
+) -> httpx.Response:
+    """拉取排行榜的第 page_no 页。"""
+    async with semaphore:
+        return await client.get(base_url, params={**params, "page_no": page_no})
 
-class VideoListData(BaseModel):
-    total: int
+
+def _upsert_stcine_rows(db: Session, rows: List[tuple]) -> Tuple[int, int]:
+    """
+    将解析好的排行榜条目写入 video 表，返回 (imported_count, updated_count)。
+
+    全部是同步数据库操作，由 sync_videos 放到线程池中执行，避免阻塞事件循环。
+    """
+    external_ids = [row[0] for row in rows]
+    existing_map: Dict[str, Video] = {}
+    if external_ids:
+        existing_map = {
+            v.external_id: v
+            for v in db.execute(
+                select(Video).where(Video.external_id.in_(external_ids))
+            ).scalars()
+        }
+
+    imported_count = 0
+    updated_count = 0
+    new_rows: Dict[str, dict] = {}
+
+    for (
+        external_id,
+        movie_id_int,
+        view_count_int,
+        ch_name,
+        name_pt,
+        langue,
+    ) in rows:
+        metadata_patch = {
+            "source": "stcine",
+            "movie_id": movie_id_int,
+            "name_pt": name_pt,
+            "langue": langue,
+        }
+
+        existing = existing_map.get(external_id)
+        pending = new_rows.get(external_id)
+        if existing:
+            existing.title = ch_name
+            existing.view_count = view_count_int
+            existing.category = "stcine_hot"
+
+            metadata = dict(existing.metadata_ or {})
+            metadata.update(metadata_patch)
+            existing.metadata_ = metadata
+            updated_count += 1
+        elif pending is not None:
+            # 同一批次里重复出现的条目按更新处理，避免唯一约束冲突
+            pending["title"] = ch_name
+            pending["view_count"] = view_count_int
+            pending["metadata_"] = {**pending["metadata_"], **metadata_patch}
+            updated_count += 1
+        else:
+            new_rows[external_id] = {
+                "external_id": external_id,
+                "title": ch_name,
+                "category": "stcine_hot",
+                "poster_url": "",
+                "view_count": view_count_int,
+                "metadata_": metadata_patch,
+                "status": "active",
+            }
+            imported_count += 1
+
+    # 新条目用一条批量 INSERT 写入，不逐个构造 ORM 对象
+    bulk_insert(db, Video, list(new_rows.values()))
+    db.commit()
+    response_cache.invalidate("videos")
+
+    return imported_count, updated_count
+
+
+def _save_upload(src: BinaryIO, dest: Path) -> None:
+    """将上传文件以 1MB 分块拷贝到目标路径。"""
+    with dest.open("wb") as out:
+        shutil.copyfileobj(src, out, length=1 << 20)
+
+
+class VideoListData(TypedDict):
+    # 仅在 with_total=true 时计算，否则为 None
+    total: Optional[int]
     items: List[VideoItem]
+    has_more: bool
+    # 游标分页：下一页请求时作为 cursor 传回；没有更多数据时为 None
+    next_cursor: Optional[int]
 
 
-class VideoListResponse(BaseModel):
+class VideoListResponse(TypedDict):
     code: int
     message: str
     data: VideoListData
@@ -71,27 +211,40 @@ class VideoCreateRequest(BaseModel):
     )
 
 
-class VideoCreateResponse(BaseModel):
+class VideoCreateResponse(TypedDict):
     code: int
     message: str
     data: VideoItem
 
 
-class SimpleResponse(BaseModel):
+class SimpleResponse(TypedDict):
     code: int
     message: str
-    data: dict = Field(default_factory=dict)
+    data: dict
+
 
+class VideoSyncData(TypedDict):
+    """同步成功时返回的统计与查询参数"""
 
-class VideoSyncResponse(BaseModel):
+    imported_count: int
+    updated_count: int
+    source: str
+    start_date: str
+    end_date: str
+    limit: int
+
+
+# 同步失败时返回 SimpleResponse（data 为空对象），与文档中的失败示例一致
+class VideoSyncResponse(TypedDict):
     code: int
     message: str
-    data: dict = Field(default_factory=dict)
+    data: VideoSyncData
 
 
 @router.get(
     "/videos",
     response_model=VideoListResponse,
+    response_class=ORJSONResponse,
     summary="查询视频列表",
     description="按分类和分页查询视频素材列表",
 )
@@ -111,56 +264,79 @@ def list_videos(
         le=100,
         description="每页数量，默认为 20，最大 100",
     ),
+    cursor: Optional[int] = Query(
+        default=None,
+        ge=1,
+        description="游标，传入上一页返回的 next_cursor；传入后忽略 page",
+    ),
+    with_total: bool = Query(
+        default=False,
+        description="是否返回总数 total；只需判断是否有下一页时用 has_more 即可",
+    ),
     db: Session = Depends(get_db),
-) -> VideoListResponse:
-    query = select(Video)
-
-    if category:
-        query = query.where(Video.category == category)
-
-    count_stmt = select(func.count()).select_from(query.subquery())
-    total: int = db.execute(count_stmt).scalar_one()
-
-    offset = (page - 1) * page_size
-    items: List[Video] = (
-        db.execute(
-            query.order_by(Video.id.desc()).offset(offset).limit(page_size)
+) -> ORJSONResponse:
+    # 只查询响应需要的列并按 RowMapping 读取，跳过 ORM 实例化与 metadata 等大字段
+    query = _apply_filters(select(*_VIDEO_LIST_COLUMNS), category)
+
+    total: Optional[int] = None
+    if with_total:
+        count_stmt = _apply_filters(
+            select(func.count()).select_from(Video), category
         )
-        .scalars()
-        .all()
-    )
-
-    video_items: List[VideoItem] = []
-    for v in items:
-        updated_at = getattr(v, "updated_at", None)
-        video_items.append(
-            VideoItem(
-                id=v.id,
-                title=v.title,
-                poster_url=v.poster_url,
-                category=v.category,
-                view_count=v.view_count,
-                updated_at=updated_at.isoformat() if updated_at else None,
-            )
+        total = db.execute(count_stmt).scalar_one()
+
+    query = query.order_by(Video.id.desc())
+    if cursor:
+        # 按主键倒序做游标分页，直接走主键索引定位，避免 OFFSET 逐行跳过
+        query = query.where(Video.id < cursor)
+    else:
+        # 兼容旧的页码分页
+        query = query.offset((page - 1) * page_size)
+
+    rows = db.execute(query.limit(page_size + 1)).mappings().all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = rows[-1]["id"] if has_more else None
+
+    # 列表数据只读且来自数据库，直接拼成 dict 交给 orjson 序列化，
+    # 跳过 response_model 的校验与 jsonable_encoder
+    video_items = [
+        {
+            "id": r["id"],
+            "title": r["title"],
+            "poster_url": r["poster_url"],
+            "category": r["category"],
+            "view_count": r["view_count"],
+            "updated_at": r["updated_at"].isoformat() if r["updated_at"] else None,
+        }
+        for r in rows
+    ]
+
+    return ORJSONResponse(
+        VideoListResponse(
+            code=0,
+            message="ok",
+            data=VideoListData(
+                total=total,
+                items=video_items,
+                has_more=has_more,
+                next_cursor=next_cursor,
+            ),
         )
-
-    return VideoListResponse(
-        code=0,
-        message="ok",
-        data=VideoListData(total=total, items=video_items),
     )
 
 
 @router.post(
     "/videos",
     response_model=VideoCreateResponse,
+    response_class=ORJSONResponse,
     summary="手动导入视频素材",
     description="通过表单手动录入或导入单条视频素材记录",
 )
 def create_video(
     payload: VideoCreateRequest,
     db: Session = Depends(get_db),
-) -> VideoCreateResponse:
+) -> ORJSONResponse:
     video = Video(
         external_id=payload.external_id,
         title=payload.title,
@@ -173,23 +349,20 @@ def create_video(
 
     db.add(video)
     db.commit()
+    response_cache.invalidate("videos")
     db.refresh(video)
 
-    item = VideoItem(
-        id=video.id,
-        title=video.title,
-        poster_url=video.poster_url,
-        category=video.category,
-        view_count=video.view_count,
-        updated_at=video.updated_at.isoformat() if video.updated_at else None,
+    return ORJSONResponse(
+        VideoCreateResponse(
+            code=0, message="ok", data=_video_item(video)
+        )
     )
 
-    return VideoCreateResponse(code=0, message="ok", data=item)
-
 
 @router.put(
     "/videos/{video_id}",
     response_model=VideoCreateResponse,
+    response_class=ORJSONResponse,
     summary="编辑视频素材",
     description="根据 ID 更新一条视频素材的展示信息",
 )
@@ -197,7 +370,7 @@ def update_video(
     video_id: int,
     payload: VideoCreateRequest,
     db: Session = Depends(get_db),
-) -> VideoCreateResponse:
+) -> ORJSONResponse:
     video: Optional[Video] = db.get(Video, video_id)
     if not video:
         # 正常使用下不会出现（都是从列表进入编辑），这里返回 code=1 和占位数据
@@ -209,10 +382,12 @@ def update_video(
             view_count=0,
             updated_at=None,
         )
-        return VideoCreateResponse(
-            code=1,
-            message=f"video {video_id} not found",
-            data=dummy,
+        return ORJSONResponse(
+            VideoCreateResponse(
+                code=1,
+                message=f"video {video_id} not found",
+                data=dummy,
+            )
         )
 
     video.title = payload.title
@@ -220,49 +395,49 @@ def update_video(
     video.poster_url = payload.poster_url
     video.view_count = payload.view_count
 
-    db.add(video)
     db.commit()
+    response_cache.invalidate("videos")
     db.refresh(video)
 
-    item = VideoItem(
-        id=video.id,
-        title=video.title,
-        poster_url=video.poster_url,
-        category=video.category,
-        view_count=video.view_count,
-        updated_at=video.updated_at.isoformat() if video.updated_at else None,
+    return ORJSONResponse(
+        VideoCreateResponse(
+            code=0, message="ok", data=_video_item(video)
+        )
     )
 
-    return VideoCreateResponse(code=0, message="ok", data=item)
-
 
 @router.delete(
     "/videos/{video_id}",
     response_model=SimpleResponse,
+    response_class=ORJSONResponse,
     summary="删除视频素材",
     description="根据 ID 删除一条视频素材记录（当前为硬删除）",
 )
 def delete_video(
     video_id: int,
     db: Session = Depends(get_db),
-) -> SimpleResponse:
+) -> ORJSONResponse:
     video: Optional[Video] = db.get(Video, video_id)
     if not video:
-        return SimpleResponse(
-            code=1,
-            message=f"video {video_id} not found",
-            data={},
+        return ORJSONResponse(
+            SimpleResponse(
+                code=1,
+                message=f"video {video_id} not found",
+                data={},
+            )
         )
 
     db.delete(video)
     db.commit()
+    response_cache.invalidate("videos")
 
-    return SimpleResponse(code=0, message="ok", data={})
+    return ORJSONResponse(SimpleResponse(code=0, message="ok", data={}))
 
 
 @router.post(
     "/videos/{video_id}/poster",
     response_model=SimpleResponse,
+    response_class=ORJSONResponse,
     summary="上传并更新视频封面",
     description="上传本地图片作为封面，并更新对应视频的 poster_url",
 )
@@ -270,20 +445,24 @@ async def upload_video_poster(
     video_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-) -> SimpleResponse:
+) -> ORJSONResponse:
     video: Optional[Video] = db.get(Video, video_id)
     if not video:
-        return SimpleResponse(
-            code=1,
-            message=f"video {video_id} not found",
-            data={},
+        return ORJSONResponse(
+            SimpleResponse(
+                code=1,
+                message=f"video {video_id} not found",
+                data={},
+            )
         )
 
     if not file.content_type or not file.content_type.startswith("image/"):
-        return SimpleResponse(
-            code=1,
-            message="仅支持上传图片文件",
-            data={},
+        return ORJSONResponse(
+            SimpleResponse(
+                code=1,
+                message="仅支持上传图片文件",
+                data={},
+            )
         )
 
     original_name = file.filename or "poster"
@@ -296,37 +475,40 @@ async def upload_video_poster(
     filename = f"poster{ext}"
     file_path = poster_dir / filename
 
-    content = await file.read()
-    file_path.write_bytes(content)
+    # 分块写入磁盘并放到线程池执行：内存占用与文件大小无关，也不阻塞事件循环
+    await run_in_threadpool(_save_upload, file.file, file_path)
 
     poster_url = f"/generated/video_posters/{video_id}/{filename}"
     video.poster_url = poster_url
 
-    db.add(video)
     db.commit()
+    response_cache.invalidate("videos")
 
-    return SimpleResponse(
-        code=0,
-        message="ok",
-        data={"poster_url": poster_url},
+    return ORJSONResponse(
+        SimpleResponse(
+            code=0,
+            message="ok",
+            data={"poster_url": poster_url},
+        )
     )
 
 
 @router.post(
     "/videos/sync",
     response_model=VideoSyncResponse,
+    response_class=ORJSONResponse,
     summary="从外部视频系统同步热门视频",
     description=(
         "根据配置的 EXTERNAL_VIDEO_API_URL 调用外部热门视频排行榜接口，"
         "将结果写入本地 video 表。当前版本实现了基于 STCine 排行榜的同步逻辑。"
     ),
 )
-def sync_videos(
+async def sync_videos(
     limit: int = Query(
         default=50,
         ge=1,
         le=500,
-        description="可选，同步的最大条数（对应排行榜的 page_size）",
+        description="可选，同步的最大条数；默认一次请求取满",
     ),
     start_date: Optional[date] = Query(
         default=None,
@@ -338,12 +520,14 @@ def sync_videos(
     ),
     db: Session = Depends(get_db),
     settings: Settings = Depends(get_settings),
-) -> VideoSyncResponse:
+) -> ORJSONResponse:
     if not settings.external_video_api_url:
-        return VideoSyncResponse(
-            code=1,
-            message="EXTERNAL_VIDEO_API_URL 未配置，请先在 .env 中设置",
-            data={},
+        return ORJSONResponse(
+            SimpleResponse(
+                code=1,
+                message="EXTERNAL_VIDEO_API_URL 未配置，请先在 .env 中设置",
+                data={},
+            )
         )
 
     if start_date is None and end_date is None:
@@ -358,50 +542,72 @@ def sync_videos(
     assert start_date is not None and end_date is not None
 
     base_url = str(settings.external_video_api_url)
-    params = {
+    # 默认单页即可取满 limit，只发一次请求
+    page_size = min(limit, settings.external_video_api_page_size)
+    params: Dict[str, object] = {
         "start_date": start_date.isoformat(),
         "end_date": end_date.isoformat(),
-        "page_no": 1,
-        "page_size": limit,
+        "page_size": page_size,
     }
+    # 各页并发请求，总耗时约等于最慢的一页
+    semaphore = asyncio.Semaphore(_STCINE_MAX_CONCURRENCY)
 
     try:
-        response = httpx.get(base_url, params=params, timeout=10.0)
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            responses = await asyncio.gather(
+                *(
+                    _fetch_stcine_page(client, semaphore, base_url, params, page_no)
+                    for page_no in range(1, math.ceil(limit / page_size) + 1)
+                )
+            )
     except httpx.RequestError as exc:
-        return VideoSyncResponse(
-            code=1,
-            message=f"调用外部排行榜接口失败: {exc}",
-            data={},
-        )
-
-    if response.status_code != 200:
-        return VideoSyncResponse(
-            code=1,
-            message=f"外部排行榜接口返回非 200 状态码: {response.status_code}",
-            data={},
+        return ORJSONResponse(
+            SimpleResponse(
+                code=1,
+                message=f"调用外部排行榜接口失败: {exc}",
+                data={},
+            )
         )
 
-    try:
-        payload = response.json()
-    except ValueError:
-        return VideoSyncResponse(
-            code=1,
-            message="外部排行榜接口返回的内容不是合法 JSON",
-            data={},
-        )
+    lists: List[dict] = []
+    for response in responses:
+        if response.status_code != 200:
+            return ORJSONResponse(
+                SimpleResponse(
+                    code=1,
+                    message=f"外部排行榜接口返回非 200 状态码: {response.status_code}",
+                    data={},
+                )
+            )
 
-    data_obj = payload.get("data") or {}
-    lists = data_obj.get("lists") or []
-    if not isinstance(lists, list):
-        return VideoSyncResponse(
-            code=1,
-            message="外部排行榜接口返回格式异常：data.lists 不是数组",
-            data={},
-        )
+        try:
+            # orjson 直接解析响应字节，比 httpx 内置的 json 解析更快
+            payload = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return ORJSONResponse(
+                SimpleResponse(
+                    code=1,
+                    message="外部排行榜接口返回的内容不是合法 JSON",
+                    data={},
+                )
+            )
 
-    imported_count = 0
-    updated_count = 0
+        data_obj = payload.get("data") or {}
+        page_lists = data_obj.get("lists") or []
+        if not isinstance(page_lists, list):
+            return ORJSONResponse(
+                SimpleResponse(
+                    code=1,
+                    message="外部排行榜接口返回格式异常：data.lists 不是数组",
+                    data={},
+                )
+            )
+        lists.extend(page_lists)
+    # 最后一页可能超出 limit，截断到请求的条数
+    del lists[limit:]
 
+    # 先解析出所有合法条目，再一次性查询已存在的记录，避免逐条 SELECT
+    rows: List[tuple] = []
     for item in lists:
         if not isinstance(item, dict):
             continue
@@ -415,68 +621,39 @@ def sync_videos(
         except (TypeError, ValueError):
             continue
 
-        external_id = f"STCine:{movie_id_int}"
-
         view_count = item.get("view_count") or 0
         try:
             view_count_int = int(view_count)
         except (TypeError, ValueError):
             view_count_int = 0
 
-        ch_name = item.get("ch_name") or item.get("name") or "未命名"
-        name_pt = item.get("name")
-        langue = item.get("langue")
-
-        stmt = select(Video).where(Video.external_id == external_id)
-        existing: Optional[Video] = db.execute(stmt).scalar_one_or_none()
-
-        if existing:
-            existing.title = ch_name
-            existing.view_count = view_count_int
-            existing.category = "stcine_hot"
-
-            metadata = dict(existing.metadata_ or {})
-            metadata.update(
-                {
-                    "source": "stcine",
-                    "movie_id": movie_id_int,
-                    "name_pt": name_pt,
-                    "langue": langue,
-                }
-            )
-            existing.metadata_ = metadata
-            updated_count += 1
-        else:
-            metadata = {
-                "source": "stcine",
-                "movie_id": movie_id_int,
-                "name_pt": name_pt,
-                "langue": langue,
-            }
-            video = Video(
-                external_id=external_id,
-                title=ch_name,
-                category="stcine_hot",
-                poster_url="",
-                view_count=view_count_int,
-                metadata_=metadata,
-                status="active",
+        rows.append(
+            (
+                f"STCine:{movie_id_int}",
+                movie_id_int,
+                view_count_int,
+                item.get("ch_name") or item.get("name") or "未命名",
+                item.get("name"),
+                item.get("langue"),
             )
-            db.add(video)
-            imported_count += 1
+        )
 
-    db.commit()
+    imported_count, updated_count = await run_in_threadpool(
+        _upsert_stcine_rows, db, rows
+    )
 
-    return VideoSyncResponse(
-        code=0,
-        message="ok",
-        data={
-            "imported_count": imported_count,
-            "updated_count": updated_count,
-            "source": "stcine",
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "limit": limit,
-        },
+    return ORJSONResponse(
+        VideoSyncResponse(
+            code=0,
+            message="ok",
+            data=VideoSyncData(
+                imported_count=imported_count,
+                updated_count=updated_count,
+                source="stcine",
+                start_date=start_date.isoformat(),
+                end_date=end_date.isoformat(),
+                limit=limit,
+            ),
+        )
     )
 
@@ -1,76 +1,122 @@
+"""
+工作流相关接口。
+
+本模块的接口刻意保持同步 `def`：数据库访问使用同步 Session，生成落地页时
+还有模板读取、HTML 写入等阻塞文件 I/O。FastAPI 会把同步接口放到线程池中执行，
+不会阻塞事件循环；若改成 `async def` 而内部仍是阻塞调用，这些调用会直接卡住
+事件循环，并发一高所有请求都会排队。
+
+如需改为异步，必须整体迁移（AsyncSession + 异步文件 I/O），不要只给接口
+加上 `async`。
+"""
+
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from typing_extensions import TypedDict
 
+from app.core.cache import response_cache
+from app.core.template_html import (
+    TemplateRenderError,
+    render_template_html,
+)
 from app.db.models import LandingPage, Template, Workflow, Video
 from app.db.session import get_db
 
 router = APIRouter(tags=["workflows"])
 
+# 当前文件位于 backend/app/api/workflows.py
+# parents[0] = .../backend/app/api
+# parents[1] = .../backend/app
+# parents[2] = .../backend
+_BACKEND_ROOT = Path(__file__).resolve().parents[2]
+_GENERATED_ROOT = _BACKEND_ROOT / "generated"
+
 
 def _get_backend_root() -> Path:
   """获取 backend 根目录，例如 LPS_creativ/LPS/backend/"""
-  # 当前文件位于 backend/app/api/workflows.py
-  # parents[0] = .../backend/app/api
-  # parents[1] = .../backend/app
-  # parents[2] = .../backend
-  return Path(__file__).resolve().parents[2]
+  return _BACKEND_ROOT
 
 
 def _get_generated_root() -> Path:
   """生成落地页 HTML 文件的根目录"""
-  return _get_backend_root() / "generated"
+  return _GENERATED_ROOT
 
 
-def _get_templates_root() -> Path:
-  """模板静态资源根目录 LPS_creativ/LPS/templates"""
-  return _get_backend_root().parent / "templates"
+# 并发写入生成文件的线程数上限
+_MAX_WRITE_WORKERS = 8
 
+# O_BINARY 仅 Windows 存在，避免换行被转换
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
 
-def _build_selected_videos_payload(
-  db: Session,
-  selected_ids: List[int],
-) -> List[dict]:
-  """
-  根据选中的视频 ID 列表，按顺序构建用于模板渲染的简要视频信息列表。
-  目前仅包含 id / poster_url / title 三个字段。
-  """
-  if not selected_ids:
-    return []
 
-  videos: List[Video] = (
-      db.execute(select(Video).where(Video.id.in_(selected_ids)))
-      .scalars()
-      .all()
+def _write_file(path: Path, data: bytes) -> None:
+  """直接通过文件描述符写入整个文件，不经过 Python 的缓冲文件对象。"""
+  fd = os.open(path, _WRITE_FLAGS, 0o644)
+  try:
+    view = memoryview(data)
+    while view:
+      view = view[os.write(fd, view):]
+  finally:
+    os.close(fd)
+
+
+# 列表接口查询的列，与 WorkflowItem 字段（除落地页数量外）一一对应
+_WORKFLOW_LIST_COLUMNS = (
+    Workflow.id,
+    Workflow.name,
+    Workflow.status,
+    Workflow.created_by,
+    Workflow.created_at,
+)
+
+
+# 详情接口查询的列：工作流字段与 WorkflowDetailData 对应，落地页字段与 LandingPageItem 对应
+_WORKFLOW_DETAIL_COLUMNS = (
+    Workflow.id,
+    Workflow.name,
+    Workflow.status,
+    Workflow.created_by,
+    Workflow.created_at,
+    Workflow.updated_at,
+)
+_LANDING_PAGE_COLUMNS = (
+    LandingPage.id.label("lp_id"),
+    LandingPage.template_id,
+    LandingPage.selected_video_ids,
+    LandingPage.generated_page_url,
+)
+
+
+def _missing_video_ids(db: Session, video_ids: List[int]) -> List[int]:
+  """用一条 IN 查询找出不存在的视频 ID（保持传入顺序、去重）"""
+  found = set(
+      db.execute(select(Video.id).where(Video.id.in_(video_ids))).scalars()
   )
-  video_map = {v.id: v for v in videos}
-
-  payload: List[dict] = []
-  for vid in selected_ids:
-    v = video_map.get(vid)
-    if not v:
-      continue
-    payload.append(
-        {
-            "id": v.id,
-            "poster_url": v.poster_url,
-            "title": v.title,
-        }
-    )
+  return [vid for vid in dict.fromkeys(video_ids) if vid not in found]
+
 
-  return payload
+def _apply_filters(stmt: Select, status: Optional[str]) -> Select:
+  """按 status 过滤（列表与计数共用）"""
+  if status:
+    stmt = stmt.where(Workflow.status == status)
+  return stmt
 
 
-class LandingPageItem(BaseModel):
+class LandingPageItem(TypedDict):
   """落地页简要信息（用于工作流详情中展示）"""
 
   id: int
@@ -79,7 +125,7 @@ class LandingPageItem(BaseModel):
   generated_page_url: str
 
 
-class WorkflowItem(BaseModel):
+class WorkflowItem(TypedDict):
   """工作流列表中的简要信息"""
 
   id: int
@@ -87,21 +133,21 @@ class WorkflowItem(BaseModel):
   status: str
   created_by: str
   created_at: str
-  landing_page_count: int = 0
+  landing_page_count: int
 
 
-class WorkflowListData(BaseModel):
+class WorkflowListData(TypedDict):
   total: int
   items: List[WorkflowItem]
 
 
-class WorkflowListResponse(BaseModel):
+class WorkflowListResponse(TypedDict):
   code: int
   message: str
   data: WorkflowListData
 
 
-class WorkflowDetailData(BaseModel):
+class WorkflowDetailData(TypedDict):
   id: int
   name: str
   status: str
@@ -111,7 +157,7 @@ class WorkflowDetailData(BaseModel):
   landing_pages: List[LandingPageItem]
 
 
-class WorkflowDetailResponse(BaseModel):
+class WorkflowDetailResponse(TypedDict):
   code: int
   message: str
   data: WorkflowDetailData
@@ -124,7 +170,7 @@ class WorkflowCreateRequest(BaseModel):
   )
 
 
-class WorkflowCreateResponse(BaseModel):
+class WorkflowCreateResponse(TypedDict):
   code: int
   message: str
   data: WorkflowItem
@@ -142,12 +188,12 @@ class WorkflowGenerateRequest(BaseModel):
   template_ids: List[int] = Field(..., min_items=1)
 
 
-class WorkflowGenerateData(BaseModel):
+class WorkflowGenerateData(TypedDict):
   workflow_id: int
   landing_pages: List[LandingPageItem]
 
 
-class WorkflowGenerateResponse(BaseModel):
+class WorkflowGenerateResponse(TypedDict):
   code: int
   message: str
   data: Optional[WorkflowGenerateData]
@@ -162,25 +208,26 @@ class WorkflowPreviewRequest(BaseModel):
   template_id: int
 
 
-class WorkflowPreviewData(BaseModel):
+class WorkflowPreviewData(TypedDict):
   preview_url: str
 
 
-class WorkflowPreviewResponse(BaseModel):
+class WorkflowPreviewResponse(TypedDict):
   code: int
   message: str
   data: Optional[WorkflowPreviewData]
 
 
-class SimpleResponse(BaseModel):
+class SimpleResponse(TypedDict):
   code: int
   message: str
-  data: dict = Field(default_factory=dict)
+  data: dict
 
 
 @router.get(
   "/workflows",
   response_model=WorkflowListResponse,
+  response_class=ORJSONResponse,
   summary="查询落地页工作流列表",
   description="按状态和分页查询工作流批次列表。",
 )
@@ -197,66 +244,59 @@ def list_workflows(
       description="每页数量，默认 20，最大 100。",
   ),
   db: Session = Depends(get_db),
-) -> WorkflowListResponse:
-  query = select(Workflow)
-
-  if status:
-    query = query.where(Workflow.status == status)
+) -> ORJSONResponse:
+  # 落地页数量用关联子查询随分页结果一并返回，省去单独的 GROUP BY 查询
+  lp_count = (
+      select(func.count(LandingPage.id))
+      .where(LandingPage.workflow_id == Workflow.id)
+      .correlate(Workflow)
+      .scalar_subquery()
+  )
+  query = _apply_filters(
+      select(*_WORKFLOW_LIST_COLUMNS, lp_count.label("lp_count")), status
+  )
 
-  count_stmt = select(func.count()).select_from(query.subquery())
+  # 直接对表计数，避免 COUNT(*) 包一层子查询
+  count_stmt = _apply_filters(select(func.count()).select_from(Workflow), status)
   total: int = db.execute(count_stmt).scalar_one()
 
   offset = (page - 1) * page_size
-  workflows: List[Workflow] = (
-      db.execute(
-          query.order_by(Workflow.id.desc()).offset(offset).limit(page_size)
-      )
-      .scalars()
-      .all()
-  )
-
-  # 预先统计每个 workflow 的落地页数量
-  if workflows:
-    wf_ids = [w.id for w in workflows]
-    lp_counts = dict(
-        db.execute(
-            select(LandingPage.workflow_id, func.count())
-            .where(LandingPage.workflow_id.in_(wf_ids))
-            .group_by(LandingPage.workflow_id)
-        ).all()
-    )
-  else:
-    lp_counts = {}
+  rows = db.execute(
+      query.order_by(Workflow.id.desc()).offset(offset).limit(page_size)
+  ).mappings()
 
   items = [
       WorkflowItem(
-          id=w.id,
-          name=w.name,
-          status=w.status,
-          created_by=w.created_by,
-          created_at=w.created_at.isoformat(),
-          landing_page_count=int(lp_counts.get(w.id, 0)),
+          id=r["id"],
+          name=r["name"],
+          status=r["status"],
+          created_by=r["created_by"],
+          created_at=r["created_at"].isoformat(),
+          landing_page_count=r["lp_count"],
       )
-      for w in workflows
+      for r in rows
   ]
 
-  return WorkflowListResponse(
-      code=0,
-      message="ok",
-      data=WorkflowListData(total=total, items=items),
+  return ORJSONResponse(
+    WorkflowListResponse(
+        code=0,
+        message="ok",
+        data=WorkflowListData(total=total, items=items),
+    )
   )
 
 
 @router.post(
   "/workflows",
   response_model=WorkflowCreateResponse,
+  response_class=ORJSONResponse,
   summary="创建落地页工作流批次",
   description="创建一个新的工作流批次，初始状态为 draft。",
 )
 def create_workflow(
   payload: WorkflowCreateRequest,
   db: Session = Depends(get_db),
-) -> WorkflowCreateResponse:
+) -> ORJSONResponse:
   workflow = Workflow(
       name=payload.name,
       status="draft",
@@ -264,6 +304,7 @@ def create_workflow(
   )
   db.add(workflow)
   db.commit()
+  response_cache.invalidate("workflows")
   db.refresh(workflow)
 
   item = WorkflowItem(
@@ -275,69 +316,78 @@ def create_workflow(
       landing_page_count=0,
   )
 
-  return WorkflowCreateResponse(code=0, message="ok", data=item)
+  return ORJSONResponse(
+    WorkflowCreateResponse(code=0, message="ok", data=item)
+  )
 
 
 @router.get(
   "/workflows/{workflow_id}",
   response_model=WorkflowDetailResponse,
+  response_class=ORJSONResponse,
   summary="查询单个工作流详情",
   description="获取单个工作流批次及其下所有落地页的详细信息。",
 )
 def get_workflow_detail(
   workflow_id: int,
   db: Session = Depends(get_db),
-) -> WorkflowDetailResponse:
-  workflow: Optional[Workflow] = db.get(Workflow, workflow_id)
+) -> ORJSONResponse:
+  # 工作流与其落地页用一条 LEFT JOIN 查询取回，只取响应需要的列；
+  # 每行带一份工作流字段，没有落地页时 lp_id 为 None
+  rows = db.execute(
+      select(*_WORKFLOW_DETAIL_COLUMNS, *_LANDING_PAGE_COLUMNS)
+      .outerjoin(LandingPage, LandingPage.workflow_id == Workflow.id)
+      .where(Workflow.id == workflow_id)
+      .order_by(LandingPage.id)
+  ).mappings().all()
+  workflow = rows[0] if rows else None
   if not workflow:
-    return WorkflowDetailResponse(
-        code=1,
-        message=f"workflow {workflow_id} not found",
-        data=WorkflowDetailData(
-            id=0,
-            name="",
-            status="",
-            created_by="",
-            created_at="",
-            updated_at="",
-            landing_pages=[],
-        ),
-    )
-
-  lps: List[LandingPage] = (
-      db.execute(
-          select(LandingPage).where(LandingPage.workflow_id == workflow_id)
+    return ORJSONResponse(
+      WorkflowDetailResponse(
+          code=1,
+          message=f"workflow {workflow_id} not found",
+          data=WorkflowDetailData(
+              id=0,
+              name="",
+              status="",
+              created_by="",
+              created_at="",
+              updated_at="",
+              landing_pages=[],
+          ),
       )
-      .scalars()
-      .all()
-  )
+    )
 
   lp_items = [
       LandingPageItem(
-          id=lp.id,
-          template_id=lp.template_id,
-          selected_video_ids=list(lp.selected_video_ids or []),
-          generated_page_url=lp.generated_page_url,
+          id=r["lp_id"],
+          template_id=r["template_id"],
+          selected_video_ids=list(r["selected_video_ids"] or []),
+          generated_page_url=r["generated_page_url"],
       )
-      for lp in lps
+      for r in rows
+      if r["lp_id"] is not None
   ]
 
   data = WorkflowDetailData(
-      id=workflow.id,
-      name=workflow.name,
-      status=workflow.status,
-      created_by=workflow.created_by,
-      created_at=workflow.created_at.isoformat(),
-      updated_at=workflow.updated_at.isoformat(),
+      id=workflow["id"],
+      name=workflow["name"],
+      status=workflow["status"],
+      created_by=workflow["created_by"],
+      created_at=workflow["created_at"].isoformat(),
+      updated_at=workflow["updated_at"].isoformat(),
       landing_pages=lp_items,
   )
 
-  return WorkflowDetailResponse(code=0, message="ok", data=data)
+  return ORJSONResponse(
+    WorkflowDetailResponse(code=0, message="ok", data=data)
+  )
 
 
 @router.post(
   "/workflows/{workflow_id}/generate",
   response_model=WorkflowGenerateResponse,
+  response_class=ORJSONResponse,
   summary="生成落地页",
   description="根据选中的视频和模板，为指定工作流生成落地页记录并输出 HTML。",
 )
@@ -345,203 +395,205 @@ def generate_landing_pages(
   workflow_id: int,
   payload: WorkflowGenerateRequest,
   db: Session = Depends(get_db),
-) -> WorkflowGenerateResponse:
+) -> ORJSONResponse:
   workflow: Optional[Workflow] = db.get(Workflow, workflow_id)
   if not workflow:
-    return WorkflowGenerateResponse(
-        code=1,
-        message=f"workflow {workflow_id} not found",
-        data=None,
+    return ORJSONResponse(
+      WorkflowGenerateResponse(
+          code=1,
+          message=f"workflow {workflow_id} not found",
+          data=None,
+      )
     )
 
   if workflow.status not in ("draft",):
-    return WorkflowGenerateResponse(
-        code=1,
-        message=f"workflow {workflow_id} is not in draft status",
-        data=None,
+    return ORJSONResponse(
+      WorkflowGenerateResponse(
+          code=1,
+          message=f"workflow {workflow_id} is not in draft status",
+          data=None,
+      )
     )
 
-  # 获取模板信息并校验
-  templates: List[Template] = (
-      db.execute(
-          select(Template).where(Template.id.in_(payload.template_ids))
+  # 获取模板信息，并通过 LEFT JOIN 一并查出该工作流下已存在的落地页，
+  # (workflow_id, template_id) 唯一，每个模板至多对应一行
+  rows = db.execute(
+      select(Template, LandingPage.id)
+      .outerjoin(
+          LandingPage,
+          and_(
+              LandingPage.template_id == Template.id,
+              LandingPage.workflow_id == workflow_id,
+          ),
       )
-      .scalars()
-      .all()
-  )
+      .where(Template.id.in_(payload.template_ids))
+  ).all()
+  templates: List[Template] = [t for t, _ in rows]
+  existing_pairs = {t.id for t, lp_id in rows if lp_id is not None}
+
   if len(templates) != len(set(payload.template_ids)):
-    return WorkflowGenerateResponse(
-        code=1,
-        message="some templates not found",
-        data=None,
+    return ORJSONResponse(
+      WorkflowGenerateResponse(
+          code=1,
+          message="some templates not found",
+          data=None,
+      )
     )
 
   # 校验每个模板所需的视频数量
   for t in templates:
     if len(payload.video_ids) < t.max_videos:
-      return WorkflowGenerateResponse(
+      return ORJSONResponse(
+        WorkflowGenerateResponse(
+            code=1,
+            message=(
+                f"模板 {t.id} 需要至少 {t.max_videos} 个视频，"
+                f"当前仅选择了 {len(payload.video_ids)} 个"
+            ),
+            data=None,
+        )
+      )
+
+  # 在渲染和写库之前一次性校验所选视频均存在
+  missing_video_ids = _missing_video_ids(db, payload.video_ids)
+  if missing_video_ids:
+    return ORJSONResponse(
+      WorkflowGenerateResponse(
           code=1,
-          message=(
-              f"模板 {t.id} 需要至少 {t.max_videos} 个视频，"
-              f"当前仅选择了 {len(payload.video_ids)} 个"
-          ),
+          message=f"以下视频不存在：{missing_video_ids}",
           data=None,
       )
+    )
 
   # 检查是否已存在相同 (workflow_id, template_id) 的落地页
-  existing_pairs = set(
-      db.execute(
-          select(LandingPage.template_id).where(
-              LandingPage.workflow_id == workflow_id,
-              LandingPage.template_id.in_(payload.template_ids),
-          )
-      ).scalars()
-  )
   if existing_pairs:
-    return WorkflowGenerateResponse(
-        code=1,
-        message=(
-            "以下模板在该工作流下已存在落地页实例，"
-            f"无法重复生成：{sorted(existing_pairs)}"
-        ),
-        data=None,
+    return ORJSONResponse(
+      WorkflowGenerateResponse(
+          code=1,
+          message=(
+              "以下模板在该工作流下已存在落地页实例，"
+              f"无法重复生成：{sorted(existing_pairs)}"
+          ),
+          data=None,
+      )
     )
 
-  landing_page_items: List[LandingPageItem] = []
-
-  # 为每个模板创建 landing_page 记录并生成 HTML 文件
+  # 先读取并渲染全部模板 HTML，任一模板有问题都在写库之前返回
+  pages: List[Tuple[Template, List[int], bytes]] = []
   for t in templates:
     # 简单策略：按传入顺序取前 max_videos 个视频
     selected_ids = payload.video_ids[: t.max_videos]
 
-    lp = LandingPage(
-        workflow_id=workflow_id,
-        template_id=t.id,
-        selected_video_ids=selected_ids,
-        generated_page_url="",
-    )
-    db.add(lp)
-    db.flush()  # 获取 lp.id
-
-    # 读取模板 HTML，并兼容多种路径写法
-    # 支持：
-    # - 绝对路径；
-    # - 相对于 LPS_creativ/LPS 的路径，例如 "templates/home/index.html"；
-    # - 相对于仓库根的路径，例如 "LPS/templates/home/index.html"。
-    raw_html_path = Path(t.html_file_path)
-    backend_root = _get_backend_root()
-    project_root = backend_root.parent          # LPS_creativ/LPS
-    repo_root = project_root.parent             # LPS_creativ
-    templates_root = _get_templates_root()      # LPS_creativ/LPS/templates
-
-    candidate_paths = [
-        raw_html_path,
-        project_root / raw_html_path,
-        repo_root / raw_html_path,
-        templates_root / raw_html_path,
-    ]
-
-    html_path: Optional[Path] = None
-    for p in candidate_paths:
-      try:
-        if p.is_file():
-          html_path = p
-          break
-      except Exception:
-        continue
-
-    if html_path is None:
-      db.rollback()
-      return WorkflowGenerateResponse(
-          code=1,
-          message=f"template html file not found for path: {t.html_file_path}",
-          data=None,
+    try:
+      html_content = render_template_html(
+          t.html_file_path, t.static_assets_path, selected_ids
+      )
+    except TemplateRenderError as e:
+      return ORJSONResponse(
+        WorkflowGenerateResponse(code=1, message=str(e), data=None)
       )
 
-    try:
-      html_content = html_path.read_text(encoding="utf-8")
-    except Exception as e:  # pragma: no cover
-      db.rollback()
-      return WorkflowGenerateResponse(
+    pages.append((t, selected_ids, html_content))
+
+  # 一条 INSERT ... RETURNING 批量创建 landing_page 记录并取回 ID，避免每个模板单独 flush。
+  # 上面的检查与插入之间可能有并发请求抢先生成，ON CONFLICT DO NOTHING 依靠
+  # uq_workflow_template 原子地跳过重复行，未返回的模板即为冲突
+  inserted: Dict[int, int] = dict(
+      db.execute(
+          pg_insert(LandingPage)
+          .values(
+              [
+                  {
+                      "workflow_id": workflow_id,
+                      "template_id": t.id,
+                      "selected_video_ids": selected_ids,
+                      "generated_page_url": "",
+                  }
+                  for t, selected_ids, _ in pages
+              ]
+          )
+          .on_conflict_do_nothing(index_elements=["workflow_id", "template_id"])
+          .returning(LandingPage.template_id, LandingPage.id)
+      ).all()
+  )
+  conflicted = sorted(t.id for t, _, _ in pages if t.id not in inserted)
+  if conflicted:
+    db.rollback()
+    return ORJSONResponse(
+      WorkflowGenerateResponse(
           code=1,
-          message=f"failed to read template html file: {e}",
+          message=(
+              "以下模板在该工作流下已存在落地页实例，"
+              f"无法重复生成：{conflicted}"
+          ),
           data=None,
       )
-
-    # 计算模板静态资源前缀（/templates/xxx），用于修正相对路径
-    static_prefix = "/templates"
-    if t.static_assets_path:
-      assets_path = Path(t.static_assets_path)
-      templates_root = _get_templates_root()
-      try:
-        if assets_path.is_absolute():
-          rel = assets_path.relative_to(templates_root)
-        else:
-          rel = (templates_root / assets_path).relative_to(templates_root)
-        static_prefix = f"/templates/{rel.as_posix()}"
-      except Exception:
-        static_prefix = "/templates"
-
-    # 将模板中的相对静态资源路径 ./xxx 改写为以 /templates/... 开头的绝对路径
-    html_content = html_content.replace('href="./', f'href="{static_prefix}/')
-    html_content = html_content.replace('src="./', f'src="{static_prefix}/')
-
-    # 在页面中注入选中视频 ID，方便后续排查
-    selected_json = json.dumps(selected_ids, ensure_ascii=False)
-    snippet = (
-        '<script id="lps-selected-videos" type="application/json">'
-        f"{selected_json}"
-        "</script>"
     )
-    if "</body>" in html_content:
-      html_content = html_content.replace("</body>", f"{snippet}\n</body>", 1)
-    else:
-      html_content += snippet
+  lp_ids = [inserted[t.id] for t, _, _ in pages]
 
-    # 写入生成目录：generated/{workflow_id}/{landing_page_id}.html
-    generated_root = _get_generated_root()
-    output_dir = generated_root / str(workflow_id)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / f"{lp.id}.html"
+  # 写入生成目录：generated/{workflow_id}/{landing_page_id}.html
+  output_dir = _get_generated_root() / str(workflow_id)
+  output_dir.mkdir(parents=True, exist_ok=True)
 
-    try:
-      output_path.write_text(html_content, encoding="utf-8")
-    except Exception as e:  # pragma: no cover
-      db.rollback()
-      return WorkflowGenerateResponse(
+  # 各落地页文件互不依赖，用线程池并发写入
+  output_paths = [output_dir / f"{lp_id}.html" for lp_id in lp_ids]
+  try:
+    with ThreadPoolExecutor(
+        max_workers=min(_MAX_WRITE_WORKERS, len(pages))
+    ) as executor:
+      list(
+          executor.map(
+              _write_file, output_paths, [html for _, _, html in pages]
+          )
+      )
+  except Exception as e:  # pragma: no cover
+    db.rollback()
+    return ORJSONResponse(
+      WorkflowGenerateResponse(
           code=1,
           message=f"failed to write generated html file: {e}",
           data=None,
       )
+    )
 
-    # 更新落地页访问 URL
-    lp.generated_page_url = f"/generated/{workflow_id}/{lp.id}.html"
+  landing_page_items = [
+      LandingPageItem(
+          id=lp_id,
+          template_id=t.id,
+          selected_video_ids=selected_ids,
+          generated_page_url=f"/generated/{workflow_id}/{lp_id}.html",
+      )
+      for lp_id, (t, selected_ids, _) in zip(lp_ids, pages)
+  ]
 
-    landing_page_items.append(
-        LandingPageItem(
-            id=lp.id,
-            template_id=lp.template_id,
-            selected_video_ids=selected_ids,
-            generated_page_url=lp.generated_page_url,
-        )
-    )
+  # 按主键批量回填落地页访问 URL
+  db.execute(
+      update(LandingPage),
+      [
+          {"id": item["id"], "generated_page_url": item["generated_page_url"]}
+          for item in landing_page_items
+      ],
+  )
 
   # 更新 workflow 状态：直接标记为 pending_ad（等待上传广告）
   workflow.status = "pending_ad"
-  db.add(workflow)
   db.commit()
+  response_cache.invalidate("workflows")
 
   data = WorkflowGenerateData(
       workflow_id=workflow_id,
       landing_pages=landing_page_items,
   )
 
-  return WorkflowGenerateResponse(code=0, message="ok", data=data)
+  return ORJSONResponse(
+    WorkflowGenerateResponse(code=0, message="ok", data=data)
+  )
 
 
 @router.post(
   "/workflows/preview",
   response_model=WorkflowPreviewResponse,
+  response_class=ORJSONResponse,
   summary="预览落地页（不落库）",
   description=(
       "根据选中的视频和单个模板，生成一个用于预览的静态 HTML 文件，并返回预览 URL。"
@@ -551,153 +603,116 @@ def generate_landing_pages(
 def preview_landing_page(
   payload: WorkflowPreviewRequest,
   db: Session = Depends(get_db),
-) -> WorkflowPreviewResponse:
+) -> ORJSONResponse:
   template: Optional[Template] = db.get(Template, payload.template_id)
   if not template:
-    return WorkflowPreviewResponse(
-        code=1,
-        message=f"template {payload.template_id} not found",
-        data=None,
+    return ORJSONResponse(
+      WorkflowPreviewResponse(
+          code=1,
+          message=f"template {payload.template_id} not found",
+          data=None,
+      )
     )
 
   if len(payload.video_ids) < template.max_videos:
-    return WorkflowPreviewResponse(
-        code=1,
-        message=(
-            f"模板 {template.id} 需要至少 {template.max_videos} 个视频，"
-            f"当前仅选择了 {len(payload.video_ids)} 个"
-        ),
-        data=None,
+    return ORJSONResponse(
+      WorkflowPreviewResponse(
+          code=1,
+          message=(
+              f"模板 {template.id} 需要至少 {template.max_videos} 个视频，"
+              f"当前仅选择了 {len(payload.video_ids)} 个"
+          ),
+          data=None,
+      )
+    )
+
+  missing_video_ids = _missing_video_ids(db, payload.video_ids)
+  if missing_video_ids:
+    return ORJSONResponse(
+      WorkflowPreviewResponse(
+          code=1,
+          message=f"以下视频不存在：{missing_video_ids}",
+          data=None,
+      )
     )
 
   # 简单策略：按传入顺序取前 max_videos 个视频
   selected_ids = payload.video_ids[: template.max_videos]
 
-  # 读取模板 HTML，并兼容多种路径写法（与 generate_landing_pages 保持一致）
-  raw_html_path = Path(template.html_file_path)
-  backend_root = _get_backend_root()
-  project_root = backend_root.parent          # LPS_creativ/LPS
-  repo_root = project_root.parent             # LPS_creativ
-  templates_root = _get_templates_root()      # LPS_creativ/LPS/templates
-
-  candidate_paths = [
-      raw_html_path,
-      project_root / raw_html_path,
-      repo_root / raw_html_path,
-      templates_root / raw_html_path,
-  ]
-
-  html_path: Optional[Path] = None
-  for p in candidate_paths:
-    try:
-      if p.is_file():
-        html_path = p
-        break
-    except Exception:
-      continue
-
-  if html_path is None:
-    return WorkflowPreviewResponse(
-        code=1,
-        message=f"template html file not found for path: {template.html_file_path}",
-        data=None,
-    )
-
   try:
-    html_content = html_path.read_text(encoding="utf-8")
-  except Exception as e:  # pragma: no cover
-    return WorkflowPreviewResponse(
-        code=1,
-        message=f"failed to read template html file: {e}",
-        data=None,
+    html_content = render_template_html(
+        template.html_file_path, template.static_assets_path, selected_ids
+    )
+  except TemplateRenderError as e:
+    return ORJSONResponse(
+      WorkflowPreviewResponse(code=1, message=str(e), data=None)
     )
-
-  # 计算模板静态资源前缀（/templates/xxx），用于修正相对路径
-  static_prefix = "/templates"
-  if template.static_assets_path:
-    assets_path = Path(template.static_assets_path)
-    templates_root = _get_templates_root()
-    try:
-      if assets_path.is_absolute():
-        rel = assets_path.relative_to(templates_root)
-      else:
-        rel = (templates_root / assets_path).relative_to(templates_root)
-      static_prefix = f"/templates/{rel.as_posix()}"
-    except Exception:
-      static_prefix = "/templates"
-
-  # 将模板中的相对静态资源路径 ./xxx 改写为以 /templates/... 开头的绝对路径
-  html_content = html_content.replace('href="./', f'href="{static_prefix}/')
-  html_content = html_content.replace('src="./', f'src="{static_prefix}/')
-
-  # 在页面中注入选中视频 ID，方便后续排查
-  selected_json = json.dumps(selected_ids, ensure_ascii=False)
-  snippet = (
-      '<script id="lps-selected-videos" type="application/json">'
-      f"{selected_json}"
-      "</script>"
-  )
-  if "</body>" in html_content:
-    html_content = html_content.replace("</body>", f"{snippet}\n</body>", 1)
-  else:
-    html_content += snippet
 
   # 写入预览目录：generated/preview/{template_id}_{uuid}.html
-  generated_root = _get_generated_root()
-  preview_dir = generated_root / "preview"
+  preview_dir = _get_generated_root() / "preview"
   preview_dir.mkdir(parents=True, exist_ok=True)
   filename = f"{template.id}_{uuid4().hex}.html"
   output_path = preview_dir / filename
 
   try:
-    output_path.write_text(html_content, encoding="utf-8")
+    _write_file(output_path, html_content)
   except Exception as e:  # pragma: no cover
-    return WorkflowPreviewResponse(
-        code=1,
-        message=f"failed to write preview html file: {e}",
-        data=None,
+    return ORJSONResponse(
+      WorkflowPreviewResponse(
+          code=1,
+          message=f"failed to write preview html file: {e}",
+          data=None,
+      )
     )
 
   preview_url = f"/generated/preview/{filename}"
 
   data = WorkflowPreviewData(preview_url=preview_url)
-  return WorkflowPreviewResponse(code=0, message="ok", data=data)
+  return ORJSONResponse(
+    WorkflowPreviewResponse(code=0, message="ok", data=data)
+  )
 
 @router.post(
   "/workflows/{workflow_id}/archive",
   response_model=SimpleResponse,
+  response_class=ORJSONResponse,
   summary="归档工作流",
   description="将工作流状态置为 archived，表示该批次已结束，仅保留历史。",
 )
 def archive_workflow(
   workflow_id: int,
   db: Session = Depends(get_db),
-) -> SimpleResponse:
+) -> ORJSONResponse:
   workflow: Optional[Workflow] = db.get(Workflow, workflow_id)
   if not workflow:
-    return SimpleResponse(
-        code=1,
-        message=f"workflow {workflow_id} not found",
-        data={},
+    return ORJSONResponse(
+      SimpleResponse(
+          code=1,
+          message=f"workflow {workflow_id} not found",
+          data={},
+      )
     )
 
   if workflow.status != "ready":
-    return SimpleResponse(
-        code=1,
-        message=f"workflow {workflow_id} is not in ready status",
-        data={},
+    return ORJSONResponse(
+      SimpleResponse(
+          code=1,
+          message=f"workflow {workflow_id} is not in ready status",
+          data={},
+      )
     )
 
   workflow.status = "archived"
-  db.add(workflow)
   db.commit()
+  response_cache.invalidate("workflows")
 
-  return SimpleResponse(code=0, message="ok", data={})
+  return ORJSONResponse(SimpleResponse(code=0, message="ok", data={}))
 
 
 @router.delete(
   "/workflows/{workflow_id}",
   response_model=SimpleResponse,
+  response_class=ORJSONResponse,
   summary="删除工作流批次",
   description=(
       "根据 ID 删除一个工作流批次。将级联删除其下所有 landing_page 记录和广告图关联，"
@@ -707,7 +722,7 @@ def archive_workflow(
 def delete_workflow(
   workflow_id: int,
   db: Session = Depends(get_db),
-) -> SimpleResponse:
+) -> ORJSONResponse:
   """
   删除指定的工作流批次。
 
@@ -718,13 +733,16 @@ def delete_workflow(
   """
   workflow: Optional[Workflow] = db.get(Workflow, workflow_id)
   if not workflow:
-    return SimpleResponse(
-        code=1,
-        message=f"workflow {workflow_id} not found",
-        data={},
+    return ORJSONResponse(
+      SimpleResponse(
+          code=1,
+          message=f"workflow {workflow_id} not found",
+          data={},
+      )
     )
 
   db.delete(workflow)
   db.commit()
+  response_cache.invalidate("workflows")
 
-  return SimpleResponse(code=0, message="ok", data={})
+  return ORJSONResponse(SimpleResponse(code=0, message="ok", data={}))
@@ -0,0 +1,165 @@
+"""
+In-process response cache for read-mostly GET list endpoints.
+
+Responses are cached per (path, sorted query string) for a short TTL and
+grouped by tag. Handlers that modify the underlying rows call
+``response_cache.invalidate(tag)`` after committing, so the next GET is
+served fresh.
+
+The cache lives in the worker process: with several workers, another
+worker may keep serving its copy until the TTL expires. It is therefore
+only enabled (RESPONSE_CACHE_ENABLED) for single-worker deployments.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL cache of serialized responses, grouped by tag.
+
+    Each tag carries a generation counter that is bumped on invalidation.
+    A response is only stored if its tag's generation did not change while
+    it was being computed, so a request racing with a write cannot put
+    stale data back into the cache.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 512) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, CachedResponse]] = {}
+        self._generations: Dict[str, int] = {}
+
+    def generation(self, tag: str) -> int:
+        with self._lock:
+            return self._generations.get(tag, 0)
+
+    def get(self, tag: str, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(tag, {}).get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[tag][key]
+                return None
+            return entry
+
+    def set(
+        self,
+        tag: str,
+        key: str,
+        generation: int,
+        status: int,
+        headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+    ) -> None:
+        with self._lock:
+            if self._generations.get(tag, 0) != generation:
+                return
+            entries = self._entries.setdefault(tag, {})
+            if key not in entries and len(entries) >= self.max_entries:
+                # 超出容量时淘汰最早写入的一条
+                del entries[next(iter(entries))]
+            entries[key] = CachedResponse(
+                status, headers, body, time.monotonic() + self.ttl_seconds
+            )
+
+    def invalidate(self, tag: str) -> None:
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            self._entries.pop(tag, None)
+
+
+# Shared by the middleware and by the handlers that invalidate tags.
+response_cache = ResponseCache()
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware serving cached GET responses for the configured paths.
+
+    ``routes`` maps an exact request path to its cache tag, e.g.
+    ``{"/api/videos": "videos"}``. Only 200 responses are stored. Every
+    response on a cached path carries an ``X-Cache: HIT`` / ``MISS`` header.
+
+    Add it before CORSMiddleware so that CORS headers, which depend on the
+    request's Origin, are applied outside the cache and never stored.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: Mapping[str, str],
+        cache: ResponseCache = response_cache,
+    ) -> None:
+        self.app = app
+        self.routes = dict(routes)
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        tag = self.routes.get(scope["path"])
+        if tag is None:
+            await self.app(scope, receive, send)
+            return
+
+        # 参数顺序不同的同一查询共用一条缓存
+        query = urlencode(sorted(parse_qsl(scope["query_string"].decode("latin-1"))))
+        key = f"{scope['path']}?{query}"
+
+        cached = self.cache.get(tag, key)
+        if cached is not None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": cached.status,
+                    "headers": cached.headers + [(b"x-cache", b"HIT")],
+                }
+            )
+            await send({"type": "http.response.body", "body": cached.body})
+            return
+
+        generation = self.cache.generation(tag)
+        start: Dict[str, object] = {}
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+                message = {
+                    **message,
+                    "headers": list(message.get("headers", []))
+                    + [(b"x-cache", b"MISS")],
+                }
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False) and start.get("status") == 200:
+                    self.cache.set(
+                        tag,
+                        key,
+                        generation,
+                        200,
+                        list(start.get("headers", [])),
+                        b"".join(chunks),
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
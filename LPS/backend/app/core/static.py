@@ -0,0 +1,53 @@
+"""
+Static file mounts with explicit browser caching headers.
+
+Starlette's StaticFiles already answers conditional requests with 304
+(ETag / Last-Modified) but sends no Cache-Control, leaving browsers to
+guess. Files whose URL never points at different content are marked
+immutable so repeat visits skip the request entirely; everything else
+is revalidated on each use.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Optional
+
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+class CachingStaticFiles(StaticFiles):
+    """
+    StaticFiles that sets Cache-Control on every file response.
+
+    ``immutable_pattern`` is matched against the path relative to the
+    mount, using "/" as separator. Matching files get a one-year
+    immutable policy; other files, and mounts without a pattern, get
+    ``no-cache`` so that edits show up on the next load via a cheap 304.
+    """
+
+    def __init__(
+        self, *, immutable_pattern: Optional[str] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self.immutable_re = (
+            re.compile(immutable_pattern) if immutable_pattern else None
+        )
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            # get_response 拿到的是按系统分隔符规范化后的路径
+            relative = path.replace("\\", "/")
+            immutable = self.immutable_re is not None and bool(
+                self.immutable_re.fullmatch(relative)
+            )
+            response.headers["Cache-Control"] = (
+                IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+            )
+        return response
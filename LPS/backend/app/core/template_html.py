@@ -0,0 +1,159 @@
+"""
+Template HTML loading shared by the template and workflow routers.
+
+Both the template preview and landing page generation/preview render a
+template the same way: resolve its ``html_file_path`` on disk, rewrite
+``./`` asset references to the template's static prefix, and inject the
+selected video IDs before the closing ``</body>``. Keeping the steps in
+one place ensures the two routers produce identical HTML.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import stat
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+# 目录在进程生命周期内不变，导入时解析一次即可，避免每个请求都 resolve()。
+# 当前文件位于 backend/app/core/template_html.py，parents[2] 即 backend
+_BACKEND_ROOT = Path(__file__).resolve().parents[2]
+_PROJECT_ROOT = _BACKEND_ROOT.parent                # LPS_creativ/LPS
+_REPO_ROOT = _PROJECT_ROOT.parent                   # LPS_creativ
+TEMPLATES_ROOT = _PROJECT_ROOT / "templates"        # LPS_creativ/LPS/templates
+
+# 匹配模板中以 ./ 开头的 href / src，一次扫描完成全部改写
+_RELATIVE_ASSET_RE = re.compile(rb'(href|src)="\./')
+
+_SELECTED_VIDEOS_OPEN = b'<script id="lps-selected-videos" type="application/json">'
+_SELECTED_VIDEOS_CLOSE = b"</script>"
+
+# 模板 html_file_path -> 实际文件路径。只缓存找到的结果，文件被移走后会重新解析
+_template_path_cache: Dict[str, Path] = {}
+
+
+class TemplateRenderError(Exception):
+    """The template HTML cannot be rendered; the message is returned to the client as-is."""
+
+
+def resolve_template_html(raw_path: str) -> Optional[Tuple[Path, int]]:
+    """
+    Locate a template's HTML file and return ``(path, mtime_ns)``, or None.
+
+    Newly registered templates store a path relative to the templates
+    directory, which is checked first. Older rows may instead hold an
+    absolute path, or one relative to LPS_creativ/LPS (e.g.
+    "templates/home/index.html") or to the repository root (e.g.
+    "LPS/templates/home/index.html"). Found paths are cached, so a repeat
+    lookup costs a single stat.
+    """
+    cached = _template_path_cache.get(raw_path)
+    if cached is not None:
+        try:
+            return cached, cached.stat().st_mtime_ns
+        except OSError:
+            _template_path_cache.pop(raw_path, None)
+
+    raw_html_path = Path(raw_path)
+    candidate_paths = (
+        TEMPLATES_ROOT / raw_html_path,
+        raw_html_path,
+        _PROJECT_ROOT / raw_html_path,
+        _REPO_ROOT / raw_html_path,
+    )
+
+    for p in candidate_paths:
+        try:
+            st = p.stat()
+        except (OSError, ValueError):
+            continue
+        if stat.S_ISREG(st.st_mode):
+            _template_path_cache[raw_path] = p
+            return p, st.st_mtime_ns
+
+    return None
+
+
+def normalize_html_file_path(raw_path: str) -> str:
+    """
+    Path to store for a template: relative to the templates directory when
+    the file lives there, otherwise ``raw_path`` unchanged.
+    """
+    resolved = resolve_template_html(raw_path)
+    if resolved is None:
+        return raw_path
+    try:
+        return resolved[0].resolve().relative_to(TEMPLATES_ROOT).as_posix()
+    except ValueError:
+        return raw_path
+
+
+def template_static_prefix(static_assets_path: Optional[str]) -> str:
+    """URL prefix (/templates/xxx) that a template's ``./`` asset references resolve to."""
+    if not static_assets_path:
+        return "/templates"
+
+    assets_path = Path(static_assets_path)
+    try:
+        if assets_path.is_absolute():
+            rel = assets_path.relative_to(TEMPLATES_ROOT)
+        else:
+            rel = (TEMPLATES_ROOT / assets_path).relative_to(TEMPLATES_ROOT)
+        return f"/templates/{rel.as_posix()}"
+    except Exception:
+        return "/templates"
+
+
+@functools.lru_cache(maxsize=256)
+def load_template_html(path_str: str, mtime_ns: int, static_prefix: str) -> bytes:
+    """
+    Read a template and rewrite ``href="./`` / ``src="./`` to ``static_prefix``.
+
+    Works on bytes throughout. Results are cached per (path, mtime,
+    prefix), so editing the template file invalidates its entry.
+    """
+    prefix = static_prefix.encode("utf-8") + b"/"
+    return _RELATIVE_ASSET_RE.sub(
+        lambda m: m.group(1) + b'="' + prefix, Path(path_str).read_bytes()
+    )
+
+
+def inject_selected_videos(html_content: bytes, selected_ids: List[int]) -> bytes:
+    """Insert the selected video IDs as a JSON script before the last ``</body>``."""
+    snippet = (
+        _SELECTED_VIDEOS_OPEN + orjson.dumps(selected_ids) + _SELECTED_VIDEOS_CLOSE
+    )
+    head, body_end, tail = html_content.rpartition(b"</body>")
+    if body_end:
+        return head + snippet + b"\n" + body_end + tail
+    return html_content + snippet
+
+
+def render_template_html(
+    html_file_path: str,
+    static_assets_path: Optional[str],
+    selected_ids: List[int],
+) -> bytes:
+    """
+    Render a template's landing page HTML with the given selected videos.
+
+    Raises TemplateRenderError if the file cannot be found or read.
+    """
+    resolved = resolve_template_html(html_file_path)
+    if resolved is None:
+        raise TemplateRenderError(
+            f"template html file not found for path: {html_file_path}"
+        )
+
+    html_path, mtime_ns = resolved
+    try:
+        html_content = load_template_html(
+            str(html_path), mtime_ns, template_static_prefix(static_assets_path)
+        )
+    except Exception as e:  # pragma: no cover
+        raise TemplateRenderError(f"failed to read template html file: {e}") from e
+
+    return inject_selected_videos(html_content, selected_ids)
@@ -7,10 +7,11 @@ The models are derived directly from the database blueprint document
 located at: LPS_creativ/Test/数据库蓝图文档.md
 """
 
-from typing import List, Optional
+from typing import List, Literal, Optional, Tuple, get_args
 
 from sqlalchemy import (
     BigInteger,
+    CheckConstraint,
     DateTime,
     ForeignKey,
     Integer,
@@ -21,10 +22,22 @@ from sqlalchemy import (
     func,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
 
+# status 的取值范围。接口层用 Literal 校验请求，数据库侧用 CHECK 约束兜底
+TemplateStatus = Literal["active", "inactive"]
+WorkflowStatus = Literal[
+    "draft", "generating", "pending_ad", "ready", "in_use", "archived"
+]
+
+
+def _status_check(name: str, values: Tuple[str, ...]) -> CheckConstraint:
+    """生成 status IN (...) 形式的 CHECK 约束。"""
+    allowed = ", ".join(f"'{v}'" for v in values)
+    return CheckConstraint(f"status IN ({allowed})", name=name)
+
 
 class Video(Base):
     """
@@ -38,6 +51,8 @@ class Video(Base):
     id: Mapped[int] = mapped_column(
         BigInteger, primary_key=True, autoincrement=True
     )
+    # 唯一约束在 PostgreSQL 中自带唯一 B-tree 索引（video_external_id_key），
+    # 同步接口按 external_id IN (...) 查询时直接走该索引，无需再单独建索引。
     external_id: Mapped[Optional[str]] = mapped_column(String(64), unique=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     category: Mapped[Optional[str]] = mapped_column(String(50))
@@ -49,14 +64,17 @@ class Video(Base):
     metadata_: Mapped[dict] = mapped_column("metadata", JSONB, default=dict)
     status: Mapped[str] = mapped_column(String(20), default="active")
     created_at: Mapped[DateTime] = mapped_column(
-        DateTime, server_default=func.now()
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[DateTime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
     )
 
+    # 列表接口按 category 过滤并按 id 倒序分页，复合索引可直接按序取出一页
     __table_args__ = (
-        Index("idx_video_category", "category"),
+        Index("idx_video_category_id", "category", "id"),
         Index("idx_video_status", "status"),
     )
 
@@ -81,7 +99,12 @@ class Template(Base):
     static_assets_path: Mapped[Optional[str]] = mapped_column(Text)
     status: Mapped[str] = mapped_column(String(20), default="active")
     created_at: Mapped[DateTime] = mapped_column(
-        DateTime, server_default=func.now()
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        _status_check("ck_template_status", get_args(TemplateStatus)),
+        Index("idx_template_status_id", "status", "id"),
     )
 
 
@@ -101,15 +124,29 @@ class Workflow(Base):
     status: Mapped[str] = mapped_column(String(30), nullable=False)
     created_by: Mapped[str] = mapped_column(String(100), nullable=False)
     created_at: Mapped[DateTime] = mapped_column(
-        DateTime, server_default=func.now()
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[DateTime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    # 删除交给数据库的 ON DELETE CASCADE，不逐条加载子记录。
+    # lazy="raise"：未在查询中显式预加载就访问会直接报错，避免隐式的 N+1 查询
+    landing_pages: Mapped[List[LandingPage]] = relationship(
+        back_populates="workflow",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="LandingPage.id",
+        lazy="raise",
     )
 
+    # 列表接口按 status 过滤并按 id 倒序分页
     __table_args__ = (
+        _status_check("ck_workflow_status", get_args(WorkflowStatus)),
         Index("idx_workflow_creator", "created_by"),
-        Index("idx_workflow_status", "status"),
+        Index("idx_workflow_status_id", "status", "id"),
     )
 
 
@@ -138,7 +175,11 @@ class LandingPage(Base):
     )
     generated_page_url: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[DateTime] = mapped_column(
-        DateTime, server_default=func.now()
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    workflow: Mapped[Workflow] = relationship(
+        back_populates="landing_pages", lazy="raise"
     )
 
     __table_args__ = (
@@ -168,7 +209,7 @@ class AdImageLibrary(Base):
     upload_batch: Mapped[Optional[str]] = mapped_column(String(50))
     status: Mapped[str] = mapped_column(String(20), default="active")
     created_at: Mapped[DateTime] = mapped_column(
-        DateTime, server_default=func.now()
+        DateTime(timezone=True), server_default=func.now()
     )
 
     __table_args__ = (
@@ -218,11 +259,11 @@ class Campaign(Base):
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     channels: Mapped[List[str]] = mapped_column(ARRAY(Text), nullable=False)
     regions: Mapped[List[str]] = mapped_column(ARRAY(Text), nullable=False)
-    launch_time: Mapped[Optional[DateTime]] = mapped_column(DateTime)
+    launch_time: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True))
     status: Mapped[str] = mapped_column(String(20), default="active")
     created_by: Mapped[str] = mapped_column(String(100), nullable=False)
     created_at: Mapped[DateTime] = mapped_column(
-        DateTime, server_default=func.now()
+        DateTime(timezone=True), server_default=func.now()
     )
     config: Mapped[dict] = mapped_column(JSONB, default=dict)
 
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Generator, Tuple
+import functools
+from typing import Any, Dict, Generator, List, Tuple
 
-from sqlalchemy import text
-from sqlalchemy.engine import Engine, create_engine
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Engine, create_engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -11,19 +12,89 @@ from ..core.config import get_settings
 from .base import Base
 
 
+# libpq TCP keepalives, so that connections cut off by the network are
+# detected by the OS instead of hanging until the next query.
+_PG_KEEPALIVE_ARGS = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+}
+
+# Compiled-statement cache entries per engine. The default (500) is
+# shared by every distinct statement shape, and the optional filters,
+# cursors and count queries of the list endpoints multiply those shapes.
+_QUERY_CACHE_SIZE = 1200
+
+_HEALTH_STMT = text("SELECT 1")
+
+
+@functools.lru_cache(maxsize=1)
 def get_engine() -> Engine:
     """
-    Create the SQLAlchemy engine.
+    Create and cache the SQLAlchemy engine.
 
-    Engine creation is cheap and stateless, but in practice you may
-    want to cache it similarly to settings. For this first milestone
-    we keep it simple and create a new engine when needed.
+    The engine owns the connection pool, so it is created once per
+    process and shared by the session factory and the health check.
+    Pool sizing comes from Settings (DB_POOL_SIZE / DB_MAX_OVERFLOW /
+    DB_POOL_RECYCLE / DB_POOL_PRE_PING).
     """
     settings = get_settings()
-    return create_engine(
-        settings.database_url.unicode_string(),
-        pool_pre_ping=True,
+    url = make_url(settings.database_url.unicode_string())
+    connect_args: Dict[str, Any] = (
+        dict(_PG_KEEPALIVE_ARGS) if url.get_backend_name() == "postgresql" else {}
+    )
+    if url.get_driver_name() == "psycopg":
+        # None turns psycopg's automatic statement preparation off
+        connect_args["prepare_threshold"] = (
+            settings.db_prepare_threshold if settings.db_prepared_statements else None
+        )
+    engine = create_engine(
+        url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        # Reuse the most recently returned connection first, so at low
+        # traffic only a few connections stay busy and the idle rest can
+        # be recycled instead of all of them being kept barely alive.
+        pool_use_lifo=True,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        query_cache_size=_QUERY_CACHE_SIZE,
+        connect_args=connect_args,
     )
+    _install_session_timeouts(engine)
+    return engine
+
+
+def _install_session_timeouts(engine: Engine) -> None:
+    """
+    Set the configured server-side timeouts on every new connection.
+
+    The timeouts are sent as SET statements after connecting rather than
+    as startup options, which poolers such as PgBouncer reject. A value
+    of 0 disables the corresponding timeout.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    settings = get_settings()
+    statements = (
+        f"SET statement_timeout = {settings.db_statement_timeout_ms}",
+        "SET idle_in_transaction_session_timeout = "
+        f"{settings.db_idle_in_transaction_timeout_ms}",
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_timeouts(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+        # The SETs ran inside an implicit transaction; commit it so that
+        # the pool's rollback on checkin does not undo them.
+        dbapi_connection.commit()
 
 
 # Global session factory used by the application.
@@ -51,6 +122,23 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def bulk_insert(db: Session, model: type, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert many rows of ``model`` with a single executemany-style INSERT.
+
+    ``rows`` are dicts keyed by mapped attribute name (e.g. ``metadata_``).
+    SQLAlchemy batches them into multi-row INSERT statements
+    (insertmanyvalues, 1000 rows per statement by default) instead of
+    flushing one ORM object at a time, and no ORM instances are created.
+
+    ``db.add_all()`` is fine for a handful of objects; use this for
+    imports and syncs that may write dozens of rows or more. Nothing is
+    committed here.
+    """
+    if rows:
+        db.execute(insert(model), rows)
+
+
 def init_db() -> None:
     """
     Ensure all tables defined on the Base metadata are created.
@@ -59,13 +147,21 @@ def init_db() -> None:
     helper, but it is convenient for early local development.
     """
     engine = get_engine()
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # DDL can run far longer than the per-request statement_timeout
+            # set on pooled connections; lift it for this transaction only.
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+        Base.metadata.create_all(bind=conn)
 
 
 def get_db_health() -> Tuple[bool, dict]:
     """
     Perform a lightweight database connectivity check.
 
+    This is blocking; async callers should run it in a worker thread
+    (see /db-check in main.py).
+
     Returns:
         (ok, details) where:
           - ok is True when the check succeeded.
@@ -75,8 +171,7 @@ def get_db_health() -> Tuple[bool, dict]:
 
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
-            value = result.scalar_one()
+            value = conn.scalar(_HEALTH_STMT)
 
         return True, {"status": "connected", "test_query_result": int(value)}
     except SQLAlchemyError as exc:
@@ -1,16 +1,26 @@
 from pathlib import Path
 
-from fastapi import Depends, FastAPI
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 
-from .core.config import Settings, get_settings
+from .core.cache import ResponseCacheMiddleware
+from .core.config import get_settings
+from .core.static import CachingStaticFiles
 from .db.session import get_db_health
 from .api.videos import router as videos_router
 from .api.templates import router as templates_router
 from .api.workflows import router as workflows_router
 
 
+# 生成后不再改动的页面：{workflow_id}/{landing_page_id}.html，
+# 以及 preview/、template_preview/ 下带 uuid 的预览页
+_GENERATED_IMMUTABLE_PATTERN = (
+    r"(\d+/\d+|preview/[^/]+|template_preview/[^/]+)\.html"
+)
+
+
 def create_app() -> FastAPI:
     """
     Application factory.
@@ -24,8 +34,23 @@ def create_app() -> FastAPI:
         title="LPS Creativ API",
         description="Backend API for the LPS Creativ landing page system.",
         version=settings.api_version,
+        # 所有接口默认用 orjson 序列化响应
+        default_response_class=ORJSONResponse,
     )
 
+    # 读多写少的列表接口做短 TTL 的进程内缓存，写接口提交后按 tag 失效。
+    # 失效只作用于当前进程，多 worker 时其他进程会继续返回旧列表直到 TTL
+    # 过期，因此默认关闭，仅在单 worker 部署时通过 RESPONSE_CACHE_ENABLED 开启。
+    # 需在 CORS 之前添加，使 CORS 位于外层，缓存中不会保存跨域响应头。
+    if settings.response_cache_enabled:
+        app.add_middleware(
+            ResponseCacheMiddleware,
+            routes={
+                "/api/videos": "videos",
+                "/api/workflows": "workflows",
+            },
+        )
+
     # CORS 设置：允许本地前端（Vite dev server）访问后端 API。
     # 后续如果有正式域名，可以在这里补充。
     app.add_middleware(
@@ -41,46 +66,57 @@ def create_app() -> FastAPI:
 
     # Health endpoints (not under /api prefix on purpose, so that
     # they can be probed easily by infrastructure tools).
+    # Settings are fixed for the life of the process, so the /health
+    # payload is built once here instead of resolving a dependency and
+    # rebuilding the dict on every probe.
+    health_payload = {
+        "code": 0,
+        "message": "ok",
+        "data": {
+            "service": "lps-backend",
+            "version": settings.api_version,
+            "environment": settings.environment,
+        },
+    }
+
     @app.get("/health")
-    async def health_check(settings: Settings = Depends(get_settings)) -> dict:
+    async def health_check() -> ORJSONResponse:
         """
         Simple health endpoint.
 
         Returns static information so you can quickly verify
         that the API process is up and routing works.
         """
-        return {
-            "code": 0,
-            "message": "ok",
-            "data": {
-                "service": "lps-backend",
-                "version": settings.api_version,
-                "environment": settings.environment,
-            },
-        }
+        return ORJSONResponse(health_payload)
 
     @app.get("/db-check")
-    async def db_check() -> dict:
+    async def db_check() -> ORJSONResponse:
         """
         Database connectivity check.
 
         Tries to open a connection and run a trivial query.
         If it fails, you will get an error message instead.
         """
-        ok, details = get_db_health()
+        # get_db_health 是阻塞调用（取连接 + 查询），放到线程池执行，
+        # 数据库响应慢时不会卡住事件循环上的其他请求
+        ok, details = await run_in_threadpool(get_db_health)
 
         if ok:
-            return {
-                "code": 0,
-                "message": "ok",
+            return ORJSONResponse(
+                {
+                    "code": 0,
+                    "message": "ok",
+                    "data": details,
+                }
+            )
+
+        return ORJSONResponse(
+            {
+                "code": 1,
+                "message": "database connection failed",
                 "data": details,
             }
-
-        return {
-            "code": 1,
-            "message": "database connection failed",
-            "data": details,
-        }
+        )
 
     # Business APIs are grouped under the /api prefix.
     app.include_router(videos_router, prefix="/api")
@@ -93,14 +129,27 @@ def create_app() -> FastAPI:
     # Directory for generated landing page HTML files
     generated_dir = backend_root / "generated"
     generated_dir.mkdir(parents=True, exist_ok=True)
-    app.mount("/generated", StaticFiles(directory=str(generated_dir)), name="generated")
+    # 落地页与预览页的文件名带唯一 ID、写入后不再改动，可让浏览器长期缓存；
+    # 视频海报等会被覆盖的文件每次按 ETag 协商
+    app.mount(
+        "/generated",
+        CachingStaticFiles(
+            directory=str(generated_dir),
+            immutable_pattern=_GENERATED_IMMUTABLE_PATTERN,
+            html=False,
+            follow_symlink=False,
+        ),
+        name="generated",
+    )
 
     # Directory for template static assets (css/js/images 等)
     templates_root = backend_root.parent / "templates"
     if templates_root.exists():
         app.mount(
             "/templates",
-            StaticFiles(directory=str(templates_root)),
+            CachingStaticFiles(
+                directory=str(templates_root), html=False, follow_symlink=False
+            ),
             name="templates-static",
         )
 
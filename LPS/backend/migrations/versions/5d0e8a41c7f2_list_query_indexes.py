@@ -0,0 +1,36 @@
+"""composite indexes for list queries
+
+Revision ID: 5d0e8a41c7f2
+Revises: 27cb92c5c256
+Create Date: 2026-10-15 10:12:41.208317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0e8a41c7f2'
+down_revision: Union[str, None] = '27cb92c5c256'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # List endpoints filter on one column and page by id DESC; the
+    # (filter, id) indexes also cover the old single-column lookups.
+    op.create_index('idx_video_category_id', 'video', ['category', 'id'], unique=False)
+    op.drop_index('idx_video_category', table_name='video')
+    op.create_index('idx_template_status_id', 'template', ['status', 'id'], unique=False)
+    op.create_index('idx_workflow_status_id', 'workflow', ['status', 'id'], unique=False)
+    op.drop_index('idx_workflow_status', table_name='workflow')
+
+
+def downgrade() -> None:
+    op.create_index('idx_workflow_status', 'workflow', ['status'], unique=False)
+    op.drop_index('idx_workflow_status_id', table_name='workflow')
+    op.drop_index('idx_template_status_id', table_name='template')
+    op.create_index('idx_video_category', 'video', ['category'], unique=False)
+    op.drop_index('idx_video_category_id', table_name='video')
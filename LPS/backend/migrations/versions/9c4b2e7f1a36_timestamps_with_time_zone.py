@@ -0,0 +1,54 @@
+"""timestamps with time zone
+
+Revision ID: 9c4b2e7f1a36
+Revises: 5d0e8a41c7f2
+Create Date: 2026-10-15 14:03:52.917204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4b2e7f1a36'
+down_revision: Union[str, None] = '5d0e8a41c7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs stored as TIMESTAMP WITHOUT TIME ZONE until now.
+_COLUMNS = (
+    ('video', 'created_at'),
+    ('video', 'updated_at'),
+    ('template', 'created_at'),
+    ('workflow', 'created_at'),
+    ('workflow', 'updated_at'),
+    ('landing_page', 'created_at'),
+    ('ad_image_library', 'created_at'),
+    ('campaign', 'launch_time'),
+    ('campaign', 'created_at'),
+)
+
+
+def upgrade() -> None:
+    # Existing values were written by now() and hold the server's local
+    # time; the implicit cast interprets them in the session TimeZone,
+    # so run the migration with the same TimeZone the app connects with.
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.DateTime(),
+            type_=sa.DateTime(timezone=True),
+        )
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.DateTime(timezone=True),
+            type_=sa.DateTime(),
+        )
@@ -0,0 +1,36 @@
+"""status check constraints
+
+Revision ID: c2a7d5e94b18
+Revises: 9c4b2e7f1a36
+Create Date: 2026-10-15 16:27:09.584113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a7d5e94b18'
+down_revision: Union[str, None] = '9c4b2e7f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if existing rows hold other values; fix those rows first.
+    op.create_check_constraint(
+        'ck_template_status',
+        'template',
+        "status IN ('active', 'inactive')",
+    )
+    op.create_check_constraint(
+        'ck_workflow_status',
+        'workflow',
+        "status IN ('draft', 'generating', 'pending_ad', 'ready', 'in_use', 'archived')",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_workflow_status', 'workflow', type_='check')
+    op.drop_constraint('ck_template_status', 'template', type_='check')
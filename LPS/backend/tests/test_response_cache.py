@@ -0,0 +1,126 @@
+"""
+Tests for app.core.cache: HIT/MISS behaviour, TTL expiry and tag
+invalidation of the in-process response cache.
+
+Run from LPS/backend with:
+
+    python -m unittest discover -s tests
+"""
+
+import unittest
+from unittest import mock
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.cache import ResponseCache, ResponseCacheMiddleware
+
+
+def _build_client(cache: ResponseCache):
+    """A tiny app whose /items list reflects a mutable in-memory store."""
+    store = {"items": ["a"], "calls": 0}
+
+    async def list_items(request: Request) -> JSONResponse:
+        store["calls"] += 1
+        return JSONResponse({"items": store["items"]})
+
+    async def create_item(request: Request) -> JSONResponse:
+        store["items"] = store["items"] + ["b"]
+        cache.invalidate("items")
+        return JSONResponse({"ok": True})
+
+    async def broken(request: Request) -> JSONResponse:
+        store["calls"] += 1
+        return JSONResponse({"error": True}, status_code=500)
+
+    app = Starlette(
+        routes=[
+            Route("/items", list_items, methods=["GET"]),
+            Route("/items", create_item, methods=["POST"]),
+            Route("/broken", broken, methods=["GET"]),
+        ]
+    )
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        routes={"/items": "items", "/broken": "items"},
+        cache=cache,
+    )
+    return TestClient(app), store
+
+
+class ResponseCacheMiddlewareTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = ResponseCache(ttl_seconds=30.0)
+        self.client, self.store = _build_client(self.cache)
+
+    def test_second_get_is_a_hit(self) -> None:
+        first = self.client.get("/items")
+        second = self.client.get("/items")
+
+        self.assertEqual(first.headers["x-cache"], "MISS")
+        self.assertEqual(second.headers["x-cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(self.store["calls"], 1)
+
+    def test_query_order_shares_one_entry(self) -> None:
+        self.client.get("/items?a=1&b=2")
+        response = self.client.get("/items?b=2&a=1")
+
+        self.assertEqual(response.headers["x-cache"], "HIT")
+        self.assertEqual(self.store["calls"], 1)
+
+    def test_different_query_is_a_miss(self) -> None:
+        self.client.get("/items?page=1")
+        response = self.client.get("/items?page=2")
+
+        self.assertEqual(response.headers["x-cache"], "MISS")
+        self.assertEqual(self.store["calls"], 2)
+
+    def test_entry_expires_after_ttl(self) -> None:
+        with mock.patch("app.core.cache.time.monotonic", return_value=1000.0):
+            self.client.get("/items")
+        with mock.patch("app.core.cache.time.monotonic", return_value=1029.0):
+            self.assertEqual(self.client.get("/items").headers["x-cache"], "HIT")
+        with mock.patch("app.core.cache.time.monotonic", return_value=1030.0):
+            self.assertEqual(self.client.get("/items").headers["x-cache"], "MISS")
+        self.assertEqual(self.store["calls"], 2)
+
+    def test_write_invalidates_tag(self) -> None:
+        self.client.get("/items")
+        self.client.post("/items")
+        response = self.client.get("/items")
+
+        self.assertEqual(response.headers["x-cache"], "MISS")
+        self.assertEqual(response.json(), {"items": ["a", "b"]})
+
+    def test_non_200_is_not_stored(self) -> None:
+        self.client.get("/broken")
+        response = self.client.get("/broken")
+
+        self.assertEqual(response.headers["x-cache"], "MISS")
+        self.assertEqual(self.store["calls"], 2)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def test_set_is_dropped_if_invalidated_meanwhile(self) -> None:
+        cache = ResponseCache()
+        generation = cache.generation("items")
+        cache.invalidate("items")
+        cache.set("items", "/items?", generation, 200, [], b"stale")
+
+        self.assertIsNone(cache.get("items", "/items?"))
+
+    def test_oldest_entry_evicted_at_capacity(self) -> None:
+        cache = ResponseCache(max_entries=2)
+        for key in ("k1", "k2", "k3"):
+            cache.set("items", key, 0, 200, [], key.encode())
+
+        self.assertIsNone(cache.get("items", "k1"))
+        self.assertIsNotNone(cache.get("items", "k3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,8 +14,11 @@ export interface Template {
 }
 
 export interface TemplateListData {
-  total: number
+  // 仅在请求 with_total=true 时返回，否则为 null
+  total: number | null
   items: Template[]
+  has_more?: boolean
+  next_cursor?: number | null
 }
 
 export interface TemplateListResponse {
@@ -28,6 +31,8 @@ export interface TemplateListParams {
   status?: string
   page?: number
   page_size?: number
+  cursor?: number
+  with_total?: boolean
 }
 
 export interface TemplateInput {
@@ -43,7 +48,9 @@ export interface TemplateInput {
 export const getTemplates = async (
   params: TemplateListParams,
 ): Promise<TemplateListData> => {
-  const res = await apiClient.get<TemplateListResponse>('/templates', { params })
+  const res = await apiClient.get<TemplateListResponse>('/templates', {
+    params,
+  })
 
   if (res.data.code !== 0) {
     throw new Error(res.data.message || '获取模板列表失败')
@@ -14,8 +14,11 @@ export interface Video {
 
 // 列表接口响应 data 部分
 export interface VideoListData {
-  total: number
+  // 仅在请求 with_total=true 时返回，否则为 null
+  total: number | null
   items: Video[]
+  has_more?: boolean
+  next_cursor?: number | null
 }
 
 export interface VideoListResponse {
@@ -28,6 +31,8 @@ export interface VideoListParams {
   category?: string
   page?: number
   page_size?: number
+  cursor?: number
+  with_total?: boolean
 }
 
 // 新建 / 编辑 时使用的输入字段
@@ -83,7 +88,9 @@ export const uploadVideoPoster = async (
 export const getVideos = async (
   params: VideoListParams,
 ): Promise<VideoListData> => {
-  const response = await apiClient.get<VideoListResponse>('/videos', { params })
+  const response = await apiClient.get<VideoListResponse>('/videos', {
+    params,
+  })
 
   if (response.data.code !== 0) {
     throw new Error(response.data.message || '获取视频列表失败')
@@ -46,6 +46,8 @@ export const TemplateListPage: React.FC = () => {
     status: statusFilter,
     page,
     page_size: pageSize,
+    // 分页器需要展示总数
+    with_total: true,
   })
 
   const createMutation = useMutation({
@@ -53,6 +53,8 @@ export const VideoListPage: React.FC = () => {
   const { data, isLoading } = useVideos({
     page,
     page_size: pageSize,
+    // 分页器需要展示总数
+    with_total: true,
   })
 
   const backendBaseUrl =
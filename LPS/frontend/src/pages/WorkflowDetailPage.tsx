@@ -1,6 +1,7 @@
 import { useParams } from 'react-router-dom'
 import { Card, Typography, Table, Tag, Alert } from 'antd'
 import type { ColumnsType } from 'antd/es/table'
+import dayjs from 'dayjs'
 import { useWorkflowDetail, type LandingPage, type WorkflowStatus } from '../api/workflows'
 
 const { Title, Paragraph } = Typography
@@ -62,7 +63,8 @@ export const WorkflowDetailPage: React.FC = () => {
         <>
           <Title level={4}>工作流详情：{data.name}</Title>
           <Paragraph>
-            ID：{data.id}，创建人：{data.created_by}，创建时间：{data.created_at}
+            ID：{data.id}，创建人：{data.created_by}，创建时间：
+            {dayjs(data.created_at).format('YYYY-MM-DD HH:mm')}
           </Paragraph>
           <Paragraph>
             当前状态：
@@ -13,6 +13,7 @@ import {
   Popconfirm,
 } from 'antd'
 import type { ColumnsType } from 'antd/es/table'
+import dayjs from 'dayjs'
 import { useMutation, useQueryClient } from '@tanstack/react-query'
 import {
   useWorkflows,
@@ -144,6 +145,7 @@ export const WorkflowListPage: React.FC = () => {
       title: '创建时间',
       dataIndex: 'created_at',
       width: 200,
+      render: (value: string) => dayjs(value).format('YYYY-MM-DD HH:mm'),
     },
     {
       title: '操作',